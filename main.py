@@ -65,6 +65,7 @@ app.include_router(stt.router, prefix=settings.API_V1_STR)
 app.include_router(system.router, prefix=settings.API_V1_STR)
 app.include_router(tts.router, prefix=settings.API_V1_STR)
 app.include_router(telephony.router, prefix=settings.API_V1_STR)
+app.include_router(intent_understanding.router, prefix=settings.API_V1_STR)
 
 # Mount static routes
 @app.get("/client")
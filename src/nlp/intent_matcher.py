@@ -1,6 +1,13 @@
 # src/nlp/intent_matcher.py
-from typing import Dict, List, Tuple
+from functools import cache
+from typing import Dict, List, Optional, Set, Tuple
 from .intent_patterns import IntentType, INTENT_PATTERNS, COMPOUND_PATTERNS
+from .pattern_prefilter import PatternPrefilter, build_prefilter
+
+@cache
+def _intent_prefilter() -> Optional[PatternPrefilter]:
+    """Hyperscan prefilter for the intent patterns, compiled on first use and shared by every matcher."""
+    return build_prefilter(INTENT_PATTERNS)
 
 class IntentMatcher:
     """Class for matching intents in text using regex patterns."""
@@ -10,6 +17,13 @@ class IntentMatcher:
         self.patterns = INTENT_PATTERNS
         self.compound_patterns = COMPOUND_PATTERNS
     
+    def _candidate_intents(self, text: str) -> Optional[Set[IntentType]]:
+        """Intents whose patterns may match, or None to score them all."""
+        prefilter = _intent_prefilter()
+        if prefilter is None:
+            return None
+        return prefilter.candidates(text)
+    
     def match_intent(self, text: str) -> Tuple[IntentType, float]:
         """
         Match the intent in the given text.
@@ -29,21 +43,80 @@ class IntentMatcher:
                 # Return the first intent of the pair with high confidence
                 return intent_pair[0], 0.9
         
-        # Check each intent type
+        # Check each intent type that can match
         intent_scores: Dict[IntentType, float] = {}
+        candidates = self._candidate_intents(text)
         for intent_type, patterns in self.patterns.items():
+            if candidates is not None and intent_type not in candidates:
+                continue
+            
             score = 0.0
             for pattern in patterns:
                 matches = pattern.findall(text)
                 if matches:
-                    # Score based on match count and text coverage
-                    match_score = min(len(matches) * 0.3, 0.7)  # Cap at 0.6 for multiple matches
-                    coverage = sum(len(match) for match in matches) / max(len(text), 1)
-                    score = max(score, match_score + (coverage * 0.2))  # Max 0.9
+                    score = max(score, self._score_matches(matches, text))
                     
             if score > 0:
                 intent_scores[intent_type] = score
         
+        return self._best_intent(intent_scores)
+    
+    def match_intent_batch(self, texts: List[str]) -> List[Tuple[IntentType, float]]:
+        """
+        Match the intent of several texts in one pass over the pattern table.
+        
+        Each pattern is applied to every pending text before moving on to the
+        next pattern, so the per-call overhead of match_intent is paid once
+        for the whole batch. Results are identical to calling match_intent
+        on each text.
+        
+        Args:
+            texts: The texts to analyze for intent
+            
+        Returns:
+            List of (intent_type, confidence_score) tuples, in input order
+        """
+        results: List[Tuple[IntentType, float]] = [(IntentType.UNKNOWN, 0.0)] * len(texts)
+        pending = [i for i, text in enumerate(texts) if text and isinstance(text, str)]
+        
+        # Check for compound intents first; the first matching pair wins
+        for intent_pair, pattern in self.compound_patterns.items():
+            hits = [pattern.search(texts[i]) is not None for i in pending]
+            for i, hit in zip(pending, hits):
+                if hit:
+                    results[i] = (intent_pair[0], 0.9)
+            pending = [i for i, hit in zip(pending, hits) if not hit]
+        
+        # Score the remaining texts pattern by pattern, skipping texts the intent cannot match
+        scores: List[Dict[IntentType, float]] = [{} for _ in pending]
+        candidates = [self._candidate_intents(texts[i]) for i in pending]
+        for intent_type, patterns in self.patterns.items():
+            scored = [
+                (intent_scores, i) for intent_scores, i, intents in zip(scores, pending, candidates)
+                if intents is None or intent_type in intents
+            ]
+            for pattern in patterns:
+                all_matches = [pattern.findall(texts[i]) for _, i in scored]
+                for (intent_scores, i), matches in zip(scored, all_matches):
+                    if matches:
+                        score = self._score_matches(matches, texts[i])
+                        intent_scores[intent_type] = max(intent_scores.get(intent_type, 0.0), score)
+        
+        for i, intent_scores in zip(pending, scores):
+            results[i] = self._best_intent(intent_scores)
+        
+        return results
+    
+    @staticmethod
+    def _score_matches(matches: List[str], text: str) -> float:
+        """Score pattern matches by match count and text coverage."""
+        match_score = min(len(matches) * 0.3, 0.7)  # Cap at 0.6 for multiple matches
+        coverage = sum(len(match) for match in matches) / max(len(text), 1)
+        return match_score + (coverage * 0.2)  # Max 0.9
+    
+    @staticmethod
+    def _best_intent(intent_scores: Dict[IntentType, float]) -> Tuple[IntentType, float]:
+        """Pick the highest scoring intent, or UNKNOWN if nothing matched."""
         # Get the intent with highest score
         if intent_scores:
             best_intent = max(intent_scores.items(), key=lambda x: x[1])
@@ -67,9 +140,13 @@ class IntentMatcher:
             return []
         
         intent_scores: Dict[IntentType, float] = {}
+        candidates = self._candidate_intents(text)
         
-        # Check each intent type
+        # Check each intent type that can match
         for intent_type, patterns in self.patterns.items():
+            if candidates is not None and intent_type not in candidates:
+                continue
+            
             score = 0.0
             for pattern in patterns:
                 matches = pattern.findall(text)
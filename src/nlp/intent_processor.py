@@ -1,26 +1,110 @@
 # src/nlp/intent_processor.py
-from typing import Dict, Tuple, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Tuple, Any
 from sqlalchemy.orm import Session
 
 from .intent_matcher import IntentMatcher
-from .entity_extractor import EntityExtractor
+from .intent_patterns import IntentType
+from .entity_extractor import EntityExtractor, EntityType
 from .response_templates import ResponseGenerator
 
 from db.models import CallSession, CallIntent, Intent, Entity
 from static.constants import logger
 from db.session import SessionLocal
 
+class TextAnalysis(NamedTuple):
+    """Intents and entities detected in a piece of text."""
+    primary_intent: IntentType
+    confidence: float
+    all_intents: Tuple[Tuple[IntentType, float], ...]
+    entities: Mapping[EntityType, Tuple[str, ...]]
+
+
 class IntentProcessor:
     """
     Class for processing transcribed text to detect intents and entities,
     storing them in the database, and generating appropriate responses.
     """
     
-    def __init__(self):
-        """Initialize the intent processor with required components."""
+    def __init__(self, cache_size: int = 4096):
+        """
+        Initialize the intent processor with required components.
+        
+        Args:
+            cache_size: Number of distinct texts whose analysis is cached
+        """
         self.matcher = IntentMatcher()
         self.extractor = EntityExtractor()
         self.generator = ResponseGenerator()
+        
+        # Repeated texts skip intent and entity matching entirely
+        self._analyze = lru_cache(maxsize=cache_size)(self._analyze_text)
+    
+    def clear_cache(self) -> None:
+        """Drop all cached text analyses."""
+        self._analyze.cache_clear()
+    
+    def _analyze_text(self, text: str) -> TextAnalysis:
+        """
+        Detect intents and entities in text, without touching the database.
+        
+        Args:
+            text: The text to analyze
+            
+        Returns:
+            Immutable analysis of the text
+        """
+        primary_intent, confidence = self.matcher.match_intent(text)
+        all_intents = self.matcher.identify_intents(text)
+        entities = self.extractor.extract_entities(text)
+        
+        return TextAnalysis(
+            primary_intent=primary_intent,
+            confidence=confidence,
+            all_intents=tuple(all_intents),
+            entities=MappingProxyType({entity_type: tuple(values) for entity_type, values in entities.items()})
+        )
+    
+    def _persist(self, analysis: TextAnalysis, call_session: CallSession, db: Session) -> None:
+        """
+        Store the detected intents and entities for a call session.
+        
+        Args:
+            analysis: The text analysis to store
+            call_session: The call session the text belongs to
+            db: Database session
+        """
+        # Get or create intents in database
+        for intent_type, score in analysis.all_intents:
+            # Find or create intent
+            intent_name = intent_type.name.lower()
+            intent = db.query(Intent).filter(Intent.name == intent_name).first()
+            if not intent:
+                intent = Intent(name=intent_name, description=f"{intent_type.name} intent")
+                db.add(intent)
+                db.flush()
+            
+            # Create call intent record
+            call_intent = CallIntent(
+                call_session_id=call_session.id,
+                intent_id=intent.id,
+                confidence=score
+            )
+            db.add(call_intent)
+        
+        # Store entities in database
+        for entity_type, values in analysis.entities.items():
+            for value in values:
+                entity = Entity(
+                    call_session_id=call_session.id,
+                    entity_type=entity_type.name.lower(),
+                    entity_value=value
+                )
+                db.add(entity)
+        
+        # Commit changes to database
+        db.commit()
     
     def process_text(
         self, 
@@ -52,66 +136,28 @@ class IntentProcessor:
                 logger.error(f"Call session not found: {session_id}")
                 return {"error": "Call session not found"}, "I'm sorry, but I'm having trouble with your call session."
             
-            # Detect intents
-            primary_intent, confidence = self.matcher.match_intent(text)
-            all_intents = self.matcher.identify_intents(text)
-            
-            # Get or create intents in database
-            intent_records = []
-            for intent_type, score in all_intents:
-                # Find or create intent
-                intent_name = intent_type.name.lower()
-                intent = db.query(Intent).filter(Intent.name == intent_name).first()
-                if not intent:
-                    intent = Intent(name=intent_name, description=f"{intent_type.name} intent")
-                    db.add(intent)
-                    db.flush()
-                
-                # Create call intent record
-                call_intent = CallIntent(
-                    call_session_id=call_session.id,
-                    intent_id=intent.id,
-                    confidence=score
-                )
-                db.add(call_intent)
-                intent_records.append(call_intent)
-            
-            # Extract entities
-            entities_dict = self.extractor.extract_entities(text)
-            
-            # Store entities in database
-            entity_records = []
-            for entity_type, values in entities_dict.items():
-                for value in values:
-                    entity = Entity(
-                        call_session_id=call_session.id,
-                        entity_type=entity_type.name.lower(),
-                        entity_value=value
-                    )
-                    db.add(entity)
-                    entity_records.append(entity)
-            
-            # Commit changes to database
-            db.commit()
+            # Detect intents and entities, then store them
+            analysis = self._analyze(text)
+            self._persist(analysis, call_session, db)
             
             # Determine secondary intent for compound response
             secondary_intent = None
-            if len(all_intents) > 1:
-                secondary_intent = all_intents[1][0]
+            if len(analysis.all_intents) > 1:
+                secondary_intent = analysis.all_intents[1][0]
             
             # Generate response
             response = self.generator.generate_response(
-                primary_intent,
-                entities_dict,
+                analysis.primary_intent,
+                analysis.entities,
                 secondary_intent
             )
             
             # Prepare results
             results = {
-                "primary_intent": primary_intent.name,
-                "confidence": confidence,
-                "all_intents": [(intent.name, score) for intent, score in all_intents],
-                "entities": {entity_type.name: values for entity_type, values in entities_dict.items()},
+                "primary_intent": analysis.primary_intent.name,
+                "confidence": analysis.confidence,
+                "all_intents": [(intent.name, score) for intent, score in analysis.all_intents],
+                "entities": {entity_type.name: list(values) for entity_type, values in analysis.entities.items()},
                 "session_id": session_id,
                 "text": text
             }
@@ -0,0 +1,96 @@
+# src/nlp/pattern_prefilter.py
+import re
+from enum import Enum
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import hyperscan
+except ImportError:
+    # Optional accelerator; matching falls back to plain re scanning
+    hyperscan = None
+
+
+class PatternPrefilter:
+    """
+    Single-pass Hyperscan scan that reports which keys of a pattern table may match a text.
+    
+    Every pattern is compiled in prefilter mode, which may over-report but never
+    misses a match, so only the keys reported here need the full re scan.
+    Keys with a pattern Hyperscan cannot compile are always scanned.
+    """
+    
+    def __init__(self, patterns: Dict[Enum, List[re.Pattern]]):
+        """Compile all patterns into one block-mode database."""
+        self.always_scan: Set[Enum] = set()
+        translated = {key: [self._translate(pattern) for pattern in key_patterns]
+                      for key, key_patterns in patterns.items()}
+        
+        try:
+            self.database = self._compile(translated)
+        except hyperscan.error:
+            # Only now find the keys Hyperscan rejects, and leave them to the re scan
+            for key, expressions in translated.items():
+                try:
+                    self._compile({key: expressions})
+                except hyperscan.error:
+                    self.always_scan.add(key)
+            translated = {key: expressions for key, expressions in translated.items()
+                          if key not in self.always_scan}
+            self.database = self._compile(translated)
+        
+        self.keys: Dict[int, Enum] = {key.value: key for key in translated}
+    
+    @staticmethod
+    def _translate(pattern: re.Pattern) -> Tuple[bytes, int]:
+        """Convert a Python pattern to a Hyperscan expression and flags."""
+        source = re.sub(r'\\u([0-9A-Fa-f]{4})', r'\\x{\1}', pattern.pattern)
+        if pattern.flags & re.VERBOSE:
+            source = "(?x)" + source
+        
+        flags = (hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH
+                 | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP)
+        if pattern.flags & re.IGNORECASE:
+            flags |= hyperscan.HS_FLAG_CASELESS
+        return source.encode("utf-8"), flags
+    
+    @staticmethod
+    def _compile(translated: Dict[Enum, List[Tuple[bytes, int]]]) -> "hyperscan.Database":
+        """Compile translated expressions into one database, tagging each with its key's value."""
+        expressions, ids, flags = [], [], []
+        for key, key_expressions in translated.items():
+            for expression, expression_flags in key_expressions:
+                expressions.append(expression)
+                ids.append(key.value)
+                flags.append(expression_flags)
+        
+        database = hyperscan.Database()
+        database.compile(expressions=expressions, ids=ids, elements=len(expressions), flags=flags)
+        return database
+    
+    def candidates(self, text: str) -> Optional[Set[Enum]]:
+        """
+        Scan the text once and return the keys whose patterns may match.
+        
+        Returns:
+            Set of candidate keys, or None if the scan failed
+        """
+        found: Set[Enum] = set(self.always_scan)
+        
+        def on_match(key_id, start, end, flags, context):
+            found.add(self.keys[key_id])
+        
+        try:
+            self.database.scan(text.encode("utf-8"), match_event_handler=on_match)
+        except (hyperscan.error, UnicodeEncodeError):
+            return None
+        return found
+
+
+def build_prefilter(patterns: Dict[Enum, List[re.Pattern]]) -> Optional[PatternPrefilter]:
+    """Build a Hyperscan prefilter for a pattern table, or None if Hyperscan is unavailable."""
+    if hyperscan is None:
+        return None
+    try:
+        return PatternPrefilter(patterns)
+    except hyperscan.error:
+        return None
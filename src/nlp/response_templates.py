@@ -6,6 +6,13 @@ from static.constants import COMPOUND_RESPONSE_TEMPLATES, RESPONSE_TEMPLATES
 from .intent_patterns import IntentType
 from .entity_extractor import EntityType
 
+# Entity appended to the response for each intent, with its sentence template
+ENTITY_ENHANCEMENTS = {
+    IntentType.ACCOUNT: (EntityType.PHONE_NUMBER, " I see you're calling from {}."),
+    IntentType.PAYMENT: (EntityType.AMOUNT, " I notice you mentioned the amount {}."),
+    IntentType.INQUIRY: (EntityType.DATE, " Regarding the date you mentioned, {}."),
+}
+
 
 class ResponseGenerator:
     """Class for generating responses based on intent and entities."""
@@ -14,6 +21,15 @@ class ResponseGenerator:
         """Initialize the response generator with templates."""
         self.templates = RESPONSE_TEMPLATES
         self.compound_templates = COMPOUND_RESPONSE_TEMPLATES
+        
+        # Resolve the UNKNOWN fallback once so each call is a single lookup
+        fallback = tuple(self.templates[IntentType.UNKNOWN])
+        self._intent_templates = {
+            intent: tuple(self.templates.get(intent, fallback)) for intent in IntentType
+        }
+        self._compound_templates = {
+            intents: tuple(templates) for intents, templates in self.compound_templates.items()
+        }
     
     def generate_response(
         self, 
@@ -34,14 +50,13 @@ class ResponseGenerator:
         """
         entities = entities or {}
         
-        # Check for compound intent match first
-        if secondary_intent and (intent, secondary_intent) in self.compound_templates:
-            templates = self.compound_templates[(intent, secondary_intent)]
-            base_response = random.choice(templates)
-        else:
-            # Fall back to single intent template
-            templates = self.templates.get(intent, self.templates[IntentType.UNKNOWN])
-            base_response = random.choice(templates)
+        # Check for compound intent match first, falling back to single intent template
+        templates = None
+        if secondary_intent:
+            templates = self._compound_templates.get((intent, secondary_intent))
+        if templates is None:
+            templates = self._intent_templates.get(intent, self._intent_templates[IntentType.UNKNOWN])
+        base_response = random.choice(templates)
         
         # Enhance response with entity information if available
         enhanced_response = self._enhance_with_entities(base_response, intent, entities)
@@ -65,17 +80,11 @@ class ResponseGenerator:
         Returns:
             Enhanced response with entity information
         """
-        enhanced_response = base_response
-        
-        # Add entity-specific enhancements based on intent
-        if intent == IntentType.ACCOUNT and EntityType.PHONE_NUMBER in entities:
-            enhanced_response += f" I see you're calling from {entities[EntityType.PHONE_NUMBER][0]}."
+        # Add entity-specific enhancement based on intent
+        enhancement = ENTITY_ENHANCEMENTS.get(intent)
+        if enhancement is None or enhancement[0] not in entities:
+            return base_response
         
-        elif intent == IntentType.PAYMENT and EntityType.AMOUNT in entities:
-            enhanced_response += f" I notice you mentioned the amount {entities[EntityType.AMOUNT][0]}."
-        
-        elif intent == IntentType.INQUIRY and EntityType.DATE in entities:
-            enhanced_response += f" Regarding the date you mentioned, {entities[EntityType.DATE][0]}."
-        
-        return enhanced_response
+        entity_type, suffix = enhancement
+        return base_response + suffix.format(entities[entity_type][0])
     
\ No newline at end of file
@@ -1,5 +1,6 @@
 # src/api/nlu/intent_understanding.py
 from fastapi import Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import Dict, List, Any
 from pydantic import BaseModel
@@ -7,6 +8,7 @@ from pydantic import BaseModel
 from db.session import get_db
 from db.models import CallSession
 from src.nlp.intent_processor import IntentProcessor
+from src.api.router import create_router
 
 # Create intent processor
 intent_processor = IntentProcessor()
@@ -26,6 +28,9 @@ class NLUResponse(BaseModel):
     session_id: str
     text: str
 
+router = create_router("/nlu")
+
+@router.post("/", response_model=NLUResponse, response_class=ORJSONResponse)
 async def process_text(
     request: NLURequest,
     db: Session = Depends(get_db)
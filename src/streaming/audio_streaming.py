@@ -5,7 +5,8 @@ import threading
 import time
 from fastapi.websockets import WebSocketState
 import numpy as np
-from typing import Callable, Dict, Optional, Any
+import torch
+from typing import Callable, Dict, Optional, Any, Union
 from datetime import datetime
 import wave
 from fastapi import WebSocket
@@ -22,9 +23,38 @@ class AudioStreamManager:
     This class manages active connections and processes audio streams.
     """
     
-    def __init__(self):
-        """Initialize the audio stream manager."""
+    def __init__(
+        self,
+        model: Optional[Any] = None,
+        chunk_size_ms: int = 1000,
+        buffer_size_ms: int = 5000,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize the audio stream manager.
+        
+        Args:
+            model: Loaded Whisper model used for streaming transcription (optional)
+            chunk_size_ms: Size of audio chunks to process
+            buffer_size_ms: Most audio held for transcription; older samples are dropped beyond it
+            clock: Monotonic clock that schedules streaming transcription
+            sleep: Pause between checks of the streaming buffer
+        """
         self.active_connections: Dict[str, Dict[str, Any]] = {}
+        
+        # Streaming transcription settings (16 kHz mono audio)
+        self.model = model
+        self.clock = clock
+        self.sleep = sleep
+        self.chunk_samples = 16000 * chunk_size_ms // 1000
+        self._buffer_lock = threading.Lock()
+        self.buffer_samples = 16000 * buffer_size_ms // 1000
+        self._buffered_samples = 0
+        
+        # On CUDA, chunks are uploaded on a side stream so copies overlap with transcription
+        device = getattr(model, "device", None)
+        self._copy_stream = torch.cuda.Stream(device=device) if device is not None and device.type == "cuda" else None
         self.recording_dir = RECORDING_DIR
         
         # Ensure recording directory exists
@@ -167,16 +197,16 @@ class AudioStreamManager:
                     is_speech = vad.is_speech(data, 16000)
                     
                     if is_speech:
-                        # Convert to format expected by Whisper
-                        audio_array = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+                        # Hand the 16-bit PCM to the transcriber as is
+                        audio_array = np.frombuffer(data, dtype=np.int16)
                         connection["transcriber"].add_audio_chunk(audio_array)
                 except ImportError:
                     # Fallback if webrtcvad not available
-                    audio_array = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+                    audio_array = np.frombuffer(data, dtype=np.int16)
                     connection["transcriber"].add_audio_chunk(audio_array)
             else:
                 # Standard processing for non-mobile clients
-                audio_array = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+                audio_array = np.frombuffer(data, dtype=np.int16)
                 connection["transcriber"].add_audio_chunk(audio_array)
             
             # Store in buffer
@@ -270,7 +300,11 @@ class AudioStreamManager:
         self.streaming_callback = callback
         self.is_streaming = True
         self.audio_buffer = []
-        self.last_process_time = time.time()
+        self._buffered_samples = 0
+        self.last_process_time = self.clock()
+        
+        # Set each time the processing loop drains the buffer, so producers can pace themselves
+        self.buffer_drained = threading.Event()
         
         # Start background processing thread
         self.process_thread = threading.Thread(target=self._process_audio_loop, daemon=True)
@@ -283,7 +317,55 @@ class AudioStreamManager:
         if not self.is_streaming:
             return
         
-        self.audio_buffer.append(audio_chunk)
+        # Keep the buffer as 16-bit PCM; float chunks are quantized on the way in
+        if audio_chunk.dtype != np.int16:
+            audio_chunk = (np.clip(audio_chunk, -1.0, 1.0) * 32767).astype(np.int16)
+        
+        # Start the upload now from pinned memory; transcription waits for it later. The chunk is
+        # copied straight into the pinned buffer, since it may be a read-only view of the socket data
+        if self._copy_stream is not None:
+            pinned = torch.empty(len(audio_chunk), dtype=torch.int16, pin_memory=True)
+            pinned.numpy()[:] = audio_chunk
+            with torch.cuda.stream(self._copy_stream):
+                audio_chunk = pinned.to(self.model.device, non_blocking=True)
+        
+        with self._buffer_lock:
+            self.audio_buffer.append(audio_chunk)
+            self._buffered_samples += len(audio_chunk)
+            self._trim_buffer()
+    
+    def _trim_buffer(self) -> None:
+        """Drop the oldest samples beyond the buffer window. Call with the buffer lock held."""
+        excess = self._buffered_samples - self.buffer_samples
+        if excess <= 0:
+            return
+        
+        logger.warning(f"Streaming buffer full, dropping the oldest {excess} samples")
+        while self.audio_buffer and excess >= len(self.audio_buffer[0]):
+            excess -= len(self.audio_buffer.pop(0))
+        if excess:
+            self.audio_buffer[0] = self.audio_buffer[0][excess:]
+        self._buffered_samples = self.buffer_samples
+    
+    def _take_buffer(self) -> list:
+        """Swap out the buffered chunks, so chunks added meanwhile wait for the next pass."""
+        with self._buffer_lock:
+            chunks, self.audio_buffer = self.audio_buffer, []
+            self._buffered_samples = 0
+        return chunks
+    
+    def _buffered_audio(self, chunks: list) -> Union[np.ndarray, torch.Tensor]:
+        """Join buffered 16-bit chunks into the float32 audio Whisper expects."""
+        if self._copy_stream is not None:
+            # Make sure every pending upload has landed before the model reads the buffer, and keep
+            # the allocator from reusing the chunks' memory until this stream is done with them
+            stream = torch.cuda.current_stream()
+            stream.wait_stream(self._copy_stream)
+            for chunk in chunks:
+                chunk.record_stream(stream)
+            return torch.cat(chunks).float() / 32768.0
+        
+        return np.concatenate(chunks).astype(np.float32) / 32768.0
         
     def stop(self) -> Dict[str, Any]:
         """Stop streaming transcription and return final results."""
@@ -294,10 +376,10 @@ class AudioStreamManager:
             self.process_thread.join(timeout=5.0)
         
         # Process remaining audio
-        if self.audio_buffer:
-            combined_audio = np.concatenate(self.audio_buffer)
-            model = self.get_model(self.model_name)
-            final_result = model.transcribe(combined_audio)
+        chunks = self._take_buffer()
+        if chunks:
+            combined_audio = self._buffered_audio(chunks)
+            final_result = self.model.transcribe(combined_audio)
             return final_result
         
         return {"text": "", "segments": []}
@@ -306,12 +388,12 @@ class AudioStreamManager:
         """Background thread to process audio chunks periodically."""
         while self.is_streaming:
             # Process audio when enough has accumulated
-            current_time = time.time()
+            current_time = self.clock()
             if (current_time - self.last_process_time >= 2.0) and self.audio_buffer:
+                chunks = self._take_buffer()
                 try:
-                    combined_audio = np.concatenate(self.audio_buffer)
-                    model = self.get_model(self.model_name)
-                    result = model.transcribe(combined_audio)
+                    combined_audio = self._buffered_audio(chunks)
+                    result = self.model.transcribe(combined_audio)
                     
                     if self.streaming_callback:
                         self.streaming_callback({
@@ -319,11 +401,17 @@ class AudioStreamManager:
                             "is_final": False
                         })
                     
-                    self.audio_buffer = []
                     self.last_process_time = current_time
+                    self.buffer_drained.set()
                     
                 except Exception as e:
                     logger.error(f"Error processing audio: {str(e)}")
+                    
+                    # Keep the audio for the next pass, ahead of anything added since
+                    with self._buffer_lock:
+                        self.audio_buffer[:0] = chunks
+                        self._buffered_samples += sum(len(chunk) for chunk in chunks)
+                        self._trim_buffer()
             
-            time.sleep(0.1)
+            self.sleep(0.1)
         
\ No newline at end of file
@@ -138,6 +138,7 @@ class WhisperSTTProvider(STTProvider):
         language: Optional[str] = None,
         chunk_size_ms: int = 1000,
         buffer_size_ms: int = 5000,
+        model: Optional[whisper.Whisper] = None,
         **kwargs
     ) -> Any:
         """
@@ -148,7 +149,8 @@ class WhisperSTTProvider(STTProvider):
             language: Language code if known
             chunk_size_ms: Size of audio chunks to process
             buffer_size_ms: Size of the buffer window
-            **kwargs: Additional parameters
+            model: Already loaded Whisper model to use instead of model_name (optional)
+            **kwargs: Additional parameters passed to the streaming transcriber
             
         Returns:
             A streaming transcription instance
@@ -156,8 +158,14 @@ class WhisperSTTProvider(STTProvider):
         from src.streaming.audio_streaming import AudioStreamManager
         
         # Load the model if not already loaded
-        self.get_model(model_name)
+        if model is None:
+            model = self.get_model(model_name)
         
         # Create and return a streaming transcriber
-        return AudioStreamManager()
+        return AudioStreamManager(
+            model=model,
+            chunk_size_ms=chunk_size_ms,
+            buffer_size_ms=buffer_size_ms,
+            **kwargs
+        )
     
\ No newline at end of file
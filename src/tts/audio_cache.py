@@ -1,21 +1,38 @@
 # src/tts/audio_cache.py
 import os
+import re
+import shutil
 import hashlib
 import json
+import tempfile
+from threading import RLock
 from typing import Dict, Optional
+from cachetools import LRUCache
 from static.constants import logger
 
+try:
+    import xxhash
+except ImportError:
+    # Optional accelerator; keys fall back to hashlib
+    xxhash = None
+
+# Top-level shard directories of content-addressed audio
+_SHARD_NAME = re.compile(r'[0-9a-f]{2}')
+
 class TTSAudioCache:
     """Cache for TTS audio to avoid regenerating the same speech."""
     
-    def __init__(self, cache_dir: str):
+    def __init__(self, cache_dir: str, memory_limit_bytes: int = 10 * 1024 * 1024):
         """
         Initialize the audio cache.
         
         Args:
             cache_dir: Directory to store cached audio files
+            memory_limit_bytes: Total size of recently used audio kept in memory
         """
         self.cache_dir = cache_dir
+        self._memory: LRUCache = LRUCache(maxsize=memory_limit_bytes, getsizeof=len)
+        self._memory_lock = RLock()
         self.index_file = os.path.join(cache_dir, "cache_index.json")
         self.cache_index: Dict[str, str] = {}
         
@@ -34,8 +51,19 @@ class TTSAudioCache:
     
     def _generate_key(self, text: str, voice_id: str, language_code: str) -> str:
         """Generate a cache key from the text and voice parameters."""
-        key_string = f"{text}|{voice_id}|{language_code}"
-        return hashlib.md5(key_string.encode()).hexdigest()
+        key_string = f"{voice_id}|{language_code}|{text}".encode()
+        if xxhash is not None:
+            return xxhash.xxh3_128(key_string).hexdigest()
+        return hashlib.md5(key_string).hexdigest()
+    
+    @staticmethod
+    def _legacy_key(text: str, voice_id: str, language_code: str) -> str:
+        """Index key used before content-addressed storage, to keep finding older cached audio."""
+        return hashlib.md5(f"{text}|{voice_id}|{language_code}".encode()).hexdigest()
+    
+    def _blob_path(self, key: str) -> str:
+        """Content-addressed path for a cache key, sharded to keep directories small."""
+        return os.path.join(self.cache_dir, key[:2], key[2:4], f"{key}.mp3")
     
     def get_cached_audio_path(self, text: str, voice_id: str, language_code: str) -> Optional[str]:
         """
@@ -50,12 +78,50 @@ class TTSAudioCache:
             Path to the cached audio file, or None if not found
         """
         key = self._generate_key(text, voice_id, language_code)
-        file_path = self.cache_index.get(key)
+        blob_path = self._blob_path(key)
+        if os.path.exists(blob_path):
+            return blob_path
         
+        # Audio indexed by path, including entries cached under the older md5 keys
+        file_path = self.cache_index.get(key) or self.cache_index.get(
+            self._legacy_key(text, voice_id, language_code))
         if file_path and os.path.exists(file_path):
             return file_path
         return None
     
+    def get_cached_audio(self, text: str, voice_id: str, language_code: str) -> Optional[bytes]:
+        """
+        Get cached audio, from memory if it was used recently or else from disk.
+        
+        Args:
+            text: The text that was synthesized
+            voice_id: The voice ID used
+            language_code: The language code used
+            
+        Returns:
+            The cached audio, or None if not found
+        """
+        key = self._generate_key(text, voice_id, language_code)
+        with self._memory_lock:
+            audio_content = self._memory.get(key)
+        if audio_content is not None:
+            return audio_content
+        
+        file_path = self.get_cached_audio_path(text, voice_id, language_code)
+        if file_path is None:
+            return None
+        
+        with open(file_path, 'rb') as f:
+            audio_content = f.read()
+        self._remember(key, audio_content)
+        return audio_content
+    
+    def _remember(self, key: str, audio_content: bytes) -> None:
+        """Keep audio in the in-memory cache, unless it alone exceeds the memory limit."""
+        with self._memory_lock:
+            if len(audio_content) <= self._memory.maxsize:
+                self._memory[key] = audio_content
+    
     def cache_audio(self, text: str, voice_id: str, language_code: str, audio_path: str) -> str:
         """
         Add an audio file to the cache.
@@ -81,6 +147,40 @@ class TTSAudioCache:
         
         return audio_path
     
+    def store_audio(self, text: str, voice_id: str, language_code: str, audio_content: bytes) -> str:
+        """
+        Write synthesized audio into the cache at its content-addressed path.
+        
+        The file is written to a temporary name and renamed into place, so
+        concurrent readers never see a partially written file. Its path is
+        derived from the key, so no index entry is needed.
+        
+        Args:
+            text: The text that was synthesized
+            voice_id: The voice ID used
+            language_code: The language code used
+            audio_content: The synthesized audio
+            
+        Returns:
+            Path to the cached audio file
+        """
+        key = self._generate_key(text, voice_id, language_code)
+        audio_path = self._blob_path(key)
+        shard_dir = os.path.dirname(audio_path)
+        os.makedirs(shard_dir, exist_ok=True)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=shard_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(audio_content)
+            os.replace(tmp_path, audio_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        
+        self._remember(key, audio_content)
+        return audio_path
+    
     def clear_cache(self) -> None:
         """Clear the entire cache, removing all files."""
         for _, file_path in self.cache_index.items():
@@ -90,7 +190,14 @@ class TTSAudioCache:
                 except Exception as e:
                     logger.error(f"Error removing cached file {file_path}: {str(e)}")
         
+        # Remove the content-addressed shards
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_dir() and _SHARD_NAME.fullmatch(entry.name):
+                shutil.rmtree(entry.path, ignore_errors=True)
+        
         self.cache_index = {}
+        with self._memory_lock:
+            self._memory.clear()
         
         # Save empty index
         try:
@@ -7,7 +7,6 @@ import edge_tts
 
 from config import settings
 import concurrent.futures
-from src.utils.helpers import gen_uuid_16
 from static.constants import logger
 from src.tts.tts_base import TTSProvider
 from src.tts.audio_cache import TTSAudioCache
@@ -62,11 +61,10 @@ class EdgeTTSProvider(TTSProvider):
         logger.debug(f"Selected voice: {selected_voice}")
         
         # Check cache first
-        cache_path = self.cache.get_cached_audio_path(text, selected_voice, language_code or "")
-        if cache_path:
+        cached_audio = self.cache.get_cached_audio(text, selected_voice, language_code or "")
+        if cached_audio is not None:
             logger.info(f"Using cached TTS audio for: {text[:30]}...")
-            with open(cache_path, 'rb') as f:
-                return f.read()
+            return cached_audio
         
         try:
             loop = asyncio.get_event_loop()
@@ -85,14 +83,7 @@ class EdgeTTSProvider(TTSProvider):
 
             
             # Save to cache
-            cache_file = os.path.join(
-                settings.TTS_CACHE_DIR,
-                f"tts_{gen_uuid_16()}.mp3"
-            )
-            with open(cache_file, 'wb') as f:
-                f.write(audio_content)
-            
-            self.cache.cache_audio(text, selected_voice, language_code or "", cache_file)
+            self.cache.store_audio(text, selected_voice, language_code or "", audio_content)
             
             return audio_content
             
@@ -4,7 +4,6 @@ import uuid
 from typing import Dict, List, Optional, Any
 from google.cloud import texttospeech
 from config import settings
-from src.utils.helpers import gen_uuid_16
 from static.constants import logger
 
 from src.tts.tts_base import TTSProvider
@@ -44,11 +43,10 @@ class GoogleTTSProvider(TTSProvider):
             voice_id = voice_profile["name"]
         
         # Check cache first
-        cache_path = self.cache.get_cached_audio_path(text, voice_id, language_code)
-        if cache_path:
+        cached_audio = self.cache.get_cached_audio(text, voice_id, language_code)
+        if cached_audio is not None:
             logger.info(f"Using cached TTS audio for: {text[:30]}...")
-            with open(cache_path, 'rb') as f:
-                return f.read()
+            return cached_audio
         
         try:
             # Set input text
@@ -82,14 +80,7 @@ class GoogleTTSProvider(TTSProvider):
             
             # Save to cache
             audio_content = response.audio_content
-            cache_file = os.path.join(
-                settings.TTS_CACHE_DIR,
-                f"tts_{gen_uuid_16().hex}.mp3"
-            )
-            with open(cache_file, 'wb') as f:
-                f.write(audio_content)
-            
-            self.cache.cache_audio(text, voice_id, language_code, cache_file)
+            self.cache.store_audio(text, voice_id, language_code, audio_content)
             
             return audio_content
             
@@ -1,5 +1,7 @@
 # src/tts/voice_profiles.py
-from typing import Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
 from enum import Enum
 
 class VoiceGender(Enum):
@@ -20,25 +22,29 @@ DEFAULT_VOICE_PROFILE = {
     "fallback": "en-US-Neural2-J"
 }
 
-def get_voice_for_language(language_code: str) -> Dict:
+@lru_cache(maxsize=256)
+def get_voice_for_language(language_code: str) -> Mapping:
     """
     Get the most appropriate voice for a language.
     
+    Lookups are memoized, so the profile is returned as a read-only view
+    that callers cannot modify.
+    
     Args:
         language_code: Language code (e.g., 'en-US', 'sw', 'yo')
         
     Returns:
-        Voice profile dictionary
+        Read-only voice profile mapping
     """
     # Try exact match
     if language_code in AFRICAN_VOICE_PROFILES:
-        return AFRICAN_VOICE_PROFILES[language_code]
+        return MappingProxyType(AFRICAN_VOICE_PROFILES[language_code])
     
     # Try language part only (e.g., 'en' from 'en-US')
     if '-' in language_code:
         lang_part = language_code.split('-')[0]
         if lang_part in AFRICAN_VOICE_PROFILES:
-            return AFRICAN_VOICE_PROFILES[lang_part]
+            return MappingProxyType(AFRICAN_VOICE_PROFILES[lang_part])
     
     # Return default
-    return DEFAULT_VOICE_PROFILE
+    return MappingProxyType(DEFAULT_VOICE_PROFILE)
@@ -21,6 +21,7 @@ def log_call_to_file(call_sid, phone_number, direction, status, additional_data=
         additional_data: Any additional data to log
     """
     ensure_log_directory()
+    events_log = os.path.join(LOG_DIR, "events.jsonl")
     
     # Create log entry
     log_entry = {
@@ -56,6 +57,10 @@ def log_call_to_file(call_sid, phone_number, direction, status, additional_data=
         # Write log data to file
         with open(filename, 'w') as f:
             json.dump(log_data, f, indent=2)
+        
+        # Append the event to the shared log so recent events can be tailed without a directory scan
+        with open(events_log, 'a') as f:
+            f.write(json.dumps(log_entry) + "\n")
             
         logger.info(f"Call logged to file: {filename}")
         
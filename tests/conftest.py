@@ -0,0 +1,28 @@
+# tests/conftest.py
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Import the FastAPI application once per test session (and xdist worker)."""
+    from main import app as _app
+    return _app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """
+    Share one TestClient across the session.
+    
+    It is deliberately not entered as a context manager: that would run the app's
+    startup and shutdown events, which create database tables, start telephony
+    connections and stop providers that tests never set up.
+    """
+    return TestClient(app)
+
+
+@pytest.fixture(scope="class")
+def api_client(request, client):
+    """Attach the shared TestClient to unittest-style test classes."""
+    request.cls.client = client
@@ -0,0 +1,36 @@
+# tests/fakes.py
+
+class FakeSession:
+    """Plain stand-in for a SQLAlchemy session; every query resolves to `first_result`."""
+    
+    def __init__(self, first_result=None):
+        self.first_result = first_result
+        self.queries = 0
+        self.added = []
+        self.commits = 0
+        self.is_active = True
+    
+    def query(self, *entities):
+        self.queries += 1
+        return self
+    
+    def filter(self, *criteria):
+        return self
+    
+    def first(self):
+        return self.first_result
+    
+    def add(self, instance):
+        self.added.append(instance)
+    
+    def flush(self):
+        pass
+    
+    def commit(self):
+        self.commits += 1
+    
+    def rollback(self):
+        pass
+    
+    def close(self):
+        pass
@@ -1,151 +1,158 @@
-import unittest
-from fastapi.testclient import TestClient
+import pytest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 import tempfile
 
-from main import app
+import db.session
+from db.models import CallSession, Transcription
+from sqlalchemy.orm import Query, Session
 
-client = TestClient(app)
+# Fixed call start time shared by all mocked calls
+START_TIME = datetime(2024, 1, 1)
 
-class TestAPIEndpoints(unittest.TestCase):
+
+class TestAPIEndpoints:
     """Test the main API endpoints."""
     
-    def setUp(self):
-        """Set up test environment."""
-        # Create a mock session for database operations
-        self.db_session_patcher = patch('db.session.SessionLocal')
-        self.mock_db_session = self.db_session_patcher.start()
-        
+    @pytest.fixture(autouse=True)
+    def mock_db_session(self, monkeypatch):
+        """Route every request to a fresh mock database session."""
         # Create mock db instance
-        self.mock_db = MagicMock()
-        self.mock_db_session.return_value = self.mock_db
+        self.mock_db = MagicMock(spec=Session)
         
-        # Setup mock query results
-        self.mock_db.query.return_value.filter.return_value.first.return_value = None
+        # Swap the session factory with a plain attribute assignment
+        self.mock_db_session = MagicMock(return_value=self.mock_db)
+        monkeypatch.setattr(db.session, "SessionLocal", self.mock_db_session)
         
-        # Setup mock commit
-        self.mock_db.commit = MagicMock()
+        # Share one Query mock across query()/filter() so tests only set return values
+        self.mock_query = MagicMock(spec=Query)
+        self.mock_query.filter.return_value = self.mock_query
+        self.mock_db.query.return_value = self.mock_query
+        self.mock_first = self.mock_query.first
+        self.mock_all = self.mock_query.all
         
-    def tearDown(self):
-        """Clean up after tests."""
-        self.db_session_patcher.stop()
+        # Setup mock query results
+        self.mock_first.return_value = None
     
-    def test_root_endpoint(self):
+    def test_root_endpoint(self, client):
         """Test the root endpoint returns basic information."""
         response = client.get("/")
         
-        self.assertEqual(response.status_code, 200)
+        assert response.status_code == 200
         data = response.json()
         
         # Check essential fields
-        self.assertIn("name", data)
-        self.assertIn("status", data)
-        self.assertIn("models", data)
-        self.assertIn("device", data)
-        self.assertIn("cuda_available", data)
+        assert "name" in data
+        assert "status" in data
+        assert "models" in data
+        assert "device" in data
+        assert "cuda_available" in data
         
         # Check models list
-        self.assertIsInstance(data["models"], list)
-        self.assertIn("tiny", data["models"])
-        self.assertIn("small", data["models"])
+        assert isinstance(data["models"], list)
+        assert "tiny" in data["models"]
+        assert "small" in data["models"]
     
-    def test_calls_list_endpoint(self):
+    def test_calls_list_endpoint(self, client):
         """Test the calls listing endpoint."""
         # Mock the calls list
         mock_calls = [
             MagicMock(
+                spec=CallSession,
                 id=1,
                 session_id="test_session_1",
                 customer_id=1,
-                start_time=datetime.now()
+                start_time=START_TIME
             ),
             MagicMock(
+                spec=CallSession,
                 id=2,
                 session_id="test_session_2",
                 customer_id=2,
-                start_time=datetime.now()
+                start_time=START_TIME
             )
         ]
-        self.mock_db.query.return_value.all.return_value = mock_calls
+        self.mock_all.return_value = mock_calls
         
         response = client.get("/api/v1/calls")
         
-        self.assertEqual(response.status_code, 200)
+        assert response.status_code == 200
         data = response.json()
         
         # Check response structure
-        self.assertIsInstance(data, list)
-        self.assertEqual(len(data), 2)
-        self.assertEqual(data[0]["id"], 1)
-        self.assertEqual(data[0]["session_id"], "test_session_1")
-        self.assertEqual(data[1]["id"], 2)
-        self.assertEqual(data[1]["session_id"], "test_session_2")
+        assert isinstance(data, list)
+        assert len(data) == 2
+        assert data[0]["id"] == 1
+        assert data[0]["session_id"] == "test_session_1"
+        assert data[1]["id"] == 2
+        assert data[1]["session_id"] == "test_session_2"
     
-    def test_call_detail_endpoint(self):
+    def test_call_detail_endpoint(self, client):
         """Test retrieving a specific call by session ID."""
         # Mock the call
         mock_call = MagicMock(
+            spec=CallSession,
             id=1,
             session_id="test_session_1",
             customer_id=1,
-            start_time=datetime.now()
+            start_time=START_TIME
         )
-        self.mock_db.query.return_value.filter.return_value.first.return_value = mock_call
+        self.mock_first.return_value = mock_call
         
         response = client.get("/api/v1/calls/test_session_1")
         
-        self.assertEqual(response.status_code, 200)
+        assert response.status_code == 200
         data = response.json()
         
         # Check response structure
-        self.assertEqual(data["id"], 1)
-        self.assertEqual(data["session_id"], "test_session_1")
-        self.assertEqual(data["customer_id"], 1)
+        assert data["id"] == 1
+        assert data["session_id"] == "test_session_1"
+        assert data["customer_id"] == 1
     
-    def test_call_detail_endpoint_not_found(self):
+    def test_call_detail_endpoint_not_found(self, client):
         """Test retrieving a non-existent call returns 404."""
         # Mock no call found
-        self.mock_db.query.return_value.filter.return_value.first.return_value = None
+        self.mock_first.return_value = None
         
         response = client.get("/api/v1/calls/nonexistent_session")
         
-        self.assertEqual(response.status_code, 404)
+        assert response.status_code == 404
         data = response.json()
-        self.assertIn("detail", data)
-        self.assertIn("not found", data["detail"])
+        assert "detail" in data
+        assert "not found" in data["detail"]
     
-    def test_end_call_endpoint(self):
+    def test_end_call_endpoint(self, client):
         """Test ending a call session."""
         # Mock the call
         mock_call = MagicMock(
+            spec=CallSession,
             id=1,
             session_id="test_session_1",
             customer_id=1,
-            start_time=datetime.now() 
+            start_time=START_TIME
         )
-        self.mock_db.query.return_value.filter.return_value.first.return_value = mock_call
+        self.mock_first.return_value = mock_call
         
         response = client.patch("/api/v1/calls/test_session_1?recording_url=https://example.com/recording.mp3&escalated=true")
         
-        self.assertEqual(response.status_code, 200)
+        assert response.status_code == 200
         data = response.json()
         
         # Check response
-        self.assertEqual(data["status"], "success")
-        self.assertEqual(data["call_id"], 1)
+        assert data["status"] == "success"
+        assert data["call_id"] == 1
         
         # Verify the call was updated correctly
-        self.assertIsNotNone(mock_call.end_time)
-        self.assertIsNotNone(mock_call.duration_seconds)
-        self.assertEqual(mock_call.recording_url, "https://example.com/recording.mp3")
-        self.assertTrue(mock_call.escalated)
+        assert mock_call.end_time is not None
+        assert mock_call.duration_seconds is not None
+        assert mock_call.recording_url == "https://example.com/recording.mp3"
+        assert mock_call.escalated
         
         # Verify commit was called
         self.mock_db.commit.assert_called_once()
     
     @patch('src.api.audio.process_audio')
-    def test_transcribe_audio_endpoint(self, mock_process_audio):
+    def test_transcribe_audio_endpoint(self, mock_process_audio, client):
         """Test the audio transcription endpoint."""
         # Create a temporary test file
         with tempfile.NamedTemporaryFile(suffix='.mp3') as temp_file:
@@ -172,15 +179,15 @@ class TestAPIEndpoints(unittest.TestCase):
                     data={"model": "tiny", "task": "transcribe"}
                 )
             
-            self.assertEqual(response.status_code, 200)
+            assert response.status_code == 200
             data = response.json()
             
             # Check response structure
-            self.assertEqual(data["text"], "Test transcription")
-            self.assertIn("segments", data)
-            self.assertIn("_performance", data)
+            assert data["text"] == "Test transcription"
+            assert "segments" in data
+            assert "_performance" in data
     
-    def test_transcribe_audio_invalid_model(self):
+    def test_transcribe_audio_invalid_model(self, client):
         """Test transcription with invalid model returns error."""
         with tempfile.NamedTemporaryFile(suffix='.mp3') as temp_file:
             temp_file.write(b'test audio content')
@@ -194,16 +201,16 @@ class TestAPIEndpoints(unittest.TestCase):
                     data={"model": "nonexistent", "task": "transcribe"}
                 )
             
-            self.assertEqual(response.status_code, 400)
+            assert response.status_code == 400
             data = response.json()
-            self.assertIn("detail", data)
-            self.assertIn("not available", data["detail"])
+            assert "detail" in data
+            assert "not available" in data["detail"]
     
-    def test_nlu_process_endpoint(self):
+    def test_nlu_process_endpoint(self, client):
         """Test the NLU processing endpoint."""
         # Setup mocks for NLU processing
-        mock_call_session = MagicMock(id=1, session_id="test_session_1")
-        self.mock_db.query.return_value.filter.return_value.first.return_value = mock_call_session
+        mock_call_session = MagicMock(spec=CallSession, id=1, session_id="test_session_1")
+        self.mock_first.return_value = mock_call_session
         
         with patch('src.nlp.intent_processor.IntentProcessor.process_text') as mock_process:
             # Mock the process_text result
@@ -228,22 +235,22 @@ class TestAPIEndpoints(unittest.TestCase):
                 }
             )
             
-            self.assertEqual(response.status_code, 200)
+            assert response.status_code == 200
             data = response.json()
             
             # Check response structure
-            self.assertEqual(data["primary_intent"], "GREETING")
-            self.assertEqual(data["confidence"], 0.9)
-            self.assertIn("all_intents", data)
-            self.assertIn("entities", data)
-            self.assertEqual(data["response"], "Hello! How can I assist you today?")
-            self.assertEqual(data["session_id"], "test_session_1")
-            self.assertEqual(data["text"], "Hello, how are you?")
+            assert data["primary_intent"] == "GREETING"
+            assert data["confidence"] == 0.9
+            assert "all_intents" in data
+            assert "entities" in data
+            assert data["response"] == "Hello! How can I assist you today?"
+            assert data["session_id"] == "test_session_1"
+            assert data["text"] == "Hello, how are you?"
     
-    def test_nlu_process_session_not_found(self):
+    def test_nlu_process_session_not_found(self, client):
         """Test NLU processing with non-existent session returns 404."""
         # Mock no session found
-        self.mock_db.query.return_value.filter.return_value.first.return_value = None
+        self.mock_first.return_value = None
         
         response = client.post(
             "/api/v1/nlu",
@@ -253,19 +260,19 @@ class TestAPIEndpoints(unittest.TestCase):
             }
         )
         
-        self.assertEqual(response.status_code, 404)
+        assert response.status_code == 404
         data = response.json()
-        self.assertIn("detail", data)
-        self.assertIn("not found", data["detail"])
+        assert "detail" in data
+        assert "not found" in data["detail"]
     
-    def test_transcription_segment_endpoint(self):
+    def test_transcription_segment_endpoint(self, client):
         """Test adding a transcription segment."""
         # Mock the call session
-        mock_call_session = MagicMock(id=1, session_id="test_session_1")
-        self.mock_db.query.return_value.filter.return_value.first.return_value = mock_call_session
+        mock_call_session = MagicMock(spec=CallSession, id=1, session_id="test_session_1")
+        self.mock_first.return_value = mock_call_session
         
         # Mock the transcription
-        mock_transcription = MagicMock(id=1)
+        mock_transcription = MagicMock(spec=Transcription, id=1)
         self.mock_db.add = MagicMock()
         
         # Send request to the correct endpoint
@@ -280,27 +287,25 @@ class TestAPIEndpoints(unittest.TestCase):
             }
         )
         
-        self.assertEqual(response.status_code, 200)
+        assert response.status_code == 200
         data = response.json()
         
         # Check response
-        self.assertEqual(data["status"], "success")
+        assert data["status"] == "success"
         
         # Verify db operations
         self.mock_db.add.assert_called_once()
         self.mock_db.commit.assert_called_once()
     
-    def test_system_gpu_info_endpoint(self):
+    def test_system_gpu_info_endpoint(self, client):
         """Test the GPU info endpoint."""
         # This is a simple test that just ensures the endpoint responds
         response = client.get("/api/v1/system/gpu")
         
-        self.assertEqual(response.status_code, 200)
+        assert response.status_code == 200
         data = response.json()
         
         # Check essential fields
-        self.assertIn("cuda_available", data) 
+        assert "cuda_available" in data
 
-if __name__ == "__main__":
-    unittest.main()
     
\ No newline at end of file
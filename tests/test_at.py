@@ -1,24 +1,50 @@
 # app/tests/test_at.py
 import unittest
-from fastapi.testclient import TestClient
+from unittest.mock import patch, MagicMock
+import pytest
 import os
+import re
 import json
-from main import app
+import tempfile
 from xml.etree import ElementTree as ET
 
-from src.api.integrations.at import build_voice_response
+from db.models import CallSession
+from db.session import get_db
+from src.telephony.integrations.at import AfricasTalkingProvider
 from src.utils.helpers import gen_uuid_12
 
-client = TestClient(app)
+# Expected structure of a GetDigits prompt, compiled once for the module
+GET_DIGITS_XML = re.compile(
+    r'<Response>.*<GetDigits[^>]*timeout="20"[^>]*numDigits="4".*<Say>Please enter your PIN</Say>',
+    re.DOTALL
+)
 
+# Use the tmpfs mount for scratch files when the platform provides one
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+@pytest.mark.usefixtures("api_client")
 class TestAfricasTalkingIntegration(unittest.TestCase):
     """Test the Africa's Talking integration."""
     
+    def setUp(self):
+        """Route the telephony webhooks through an offline Africa's Talking provider."""
+        with patch('src.telephony.integrations.at.africastalking'):
+            self.provider = AfricasTalkingProvider()
+        
+        provider_patch = patch('src.api.telephony.get_telephony_provider', return_value=self.provider)
+        provider_patch.start()
+        self.addCleanup(provider_patch.stop)
+        
+        # Answer with <Say> rather than synthesising audio through a TTS backend
+        tts_patch = patch('src.telephony.integrations.at.get_tts_provider', side_effect=RuntimeError("TTS disabled"))
+        tts_patch.start()
+        self.addCleanup(tts_patch.stop)
+    
     def test_voice_webhook(self):
         """Test the voice webhook endpoint."""
         # Simulate an Africa's Talking voice webhook call
-        response = client.post(
-            "/api/v1/integrations/at/voice",
+        response = self.client.post(
+            "/api/v1/telephony/voice",
             data={
                 "sessionId": "AT_TEST_123456789",
                 "callerNumber": "+2347012345678",
@@ -31,35 +57,46 @@ class TestAfricasTalkingIntegration(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.headers["content-type"], "application/xml")
         
-        # Try to parse the XML response
+        # Check that the XML contains Voice XML elements before parsing
+        self.assertIn(b"<Response>", response.content)
+        self.assertIn(b"<Say>", response.content)
+        
+        # Parse the XML response to validate its structure
         try:
-            ET.fromstring(response.content)
-            valid_xml = True
-        except:
-            valid_xml = False
+            root = ET.fromstring(response.content)
+        except ET.ParseError as e:
+            self.fail(f"Response should be valid XML: {e}")
+        
+        self.assertEqual(root.tag, "Response")
+    
+    def seed_call(self, **fields):
+        """
+        Serve a call session from a mocked database for this test only.
         
-        self.assertTrue(valid_xml, "Response should be valid XML")
+        Args:
+            **fields: Attributes to set on the CallSession mock
+            
+        Returns:
+            Tuple of (mock_db, mock_call)
+        """
+        mock_db = MagicMock()
+        mock_call = MagicMock(spec=CallSession, **fields)
+        mock_db.query.return_value.filter.return_value.first.return_value = mock_call
         
-        # Check that the XML contains Voice XML elements
-        self.assertIn("<Response>", response.text)
-        self.assertIn("<Say>", response.text)
+        overrides = self.client.app.dependency_overrides
+        overrides[get_db] = lambda: mock_db
+        self.addCleanup(overrides.pop, get_db, None)
+        
+        return mock_db, mock_call
     
     def test_events_webhook(self):
         """Test the events webhook endpoint."""
-        # Create a test call first
-        client.post(
-            "/api/v1/integrations/at/voice",
-            data={
-                "sessionId": "AT_EVENT_TEST_123",
-                "callerNumber": "+2347087654321",
-                "direction": "inbound",
-                "isActive": "1",
-            }
-        )
+        # Seed the call directly instead of going through the voice webhook
+        mock_db, mock_call = self.seed_call(id=1, session_id="AT_EVENT_TEST_123")
         
         # Now simulate an events callback
-        response = client.post(
-            "/api/v1/integrations/at/events",
+        response = self.client.post(
+            "/api/v1/telephony/events",
             data={
                 "sessionId": "AT_EVENT_TEST_123",
                 "status": "completed",
@@ -71,11 +108,15 @@ class TestAfricasTalkingIntegration(unittest.TestCase):
         # Check response
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"status": "success"})
+        
+        # Verify the seeded call was closed out
+        self.assertEqual(mock_call.duration_seconds, 120)
+        mock_db.commit.assert_called_once()
     
     def test_dtmf_webhook(self):
         """Test the DTMF webhook endpoint."""
-        response = client.post(
-            "/api/v1/integrations/at/dtmf",
+        response = self.client.post(
+            "/api/v1/telephony/dtmf",
             data={
                 "sessionId": "AT_DTMF_TEST_123",
                 "dtmfDigits": "12345",
@@ -91,30 +132,34 @@ class TestAfricasTalkingIntegration(unittest.TestCase):
         self.assertIn("<Say>", response.text)
         self.assertIn("You entered", response.text)
     
+    @pytest.mark.io
     def test_call_logging(self):
         """Test that calls are logged to files."""
         # Generate a unique call SID for this test
         test_session_id = f"AT_LOG_TEST_{gen_uuid_12()}"
         phone = "+2347055551234"
         
-        # Simulate a call
-        client.post(
-            "/api/v1/integrations/at/voice",
-            data={
-                "sessionId": test_session_id,
-                "callerNumber": phone,
-                "direction": "inbound",
-                "isActive": "1",
-            }
-        )
-        
-        # Check if log file was created
-        log_path = f"logs/calls/{test_session_id}.json"
-        self.assertTrue(os.path.exists(log_path), f"Log file {log_path} should exist")
-        
-        # Check log content
-        with open(log_path, 'r') as f:
-            log_data = json.load(f)
+        # Redirect call logs to a throwaway directory, in memory where available
+        with tempfile.TemporaryDirectory(dir=SHM_DIR) as log_dir, \
+                patch('src.utils.at_utils.LOG_DIR', log_dir):
+            # Simulate a call
+            self.client.post(
+                "/api/v1/telephony/voice",
+                data={
+                    "sessionId": test_session_id,
+                    "callerNumber": phone,
+                    "direction": "inbound",
+                    "isActive": "1",
+                }
+            )
+            
+            # Check if log file was created
+            log_path = os.path.join(log_dir, f"{test_session_id}.json")
+            self.assertTrue(os.path.exists(log_path), f"Log file {log_path} should exist")
+            
+            # Check log content
+            with open(log_path, 'r') as f:
+                log_data = json.load(f)
         
         # Verify log data
         self.assertEqual(log_data["call_sid"], test_session_id)
@@ -124,12 +169,12 @@ class TestAfricasTalkingIntegration(unittest.TestCase):
         """Test XML generation functions."""
         
         # Test simple say response
-        xml = build_voice_response(say_text="Hello, test")
+        xml = self.provider.build_voice_response(say_text="Hello, test")
         self.assertIn("<Response>", xml)
         self.assertIn("<Say>Hello, test</Say>", xml)
         
         # Test GetDigits response
-        xml = build_voice_response(get_digits={
+        xml = self.provider.build_voice_response(get_digits={
             "say": "Please enter your PIN",
             "config": {
                 "timeout": 20,
@@ -137,11 +182,8 @@ class TestAfricasTalkingIntegration(unittest.TestCase):
                 "numDigits": 4
             }
         })
-        self.assertIn("<GetDigits", xml)
-        self.assertIn("timeout=\"20\"", xml)
-        self.assertIn("numDigits=\"4\"", xml)
-        self.assertIn("<Say>Please enter your PIN</Say>", xml)
+        self.assertRegex(xml, GET_DIGITS_XML)
 
 if __name__ == "__main__":
-    unittest.main()
+    raise SystemExit(pytest.main([__file__]))
     
\ No newline at end of file
@@ -0,0 +1,34 @@
+# tests/test_call_logs.py
+import json
+import pytest
+
+from tools.call_logs import open_tail
+
+
+@pytest.fixture
+def events_log(tmp_path):
+    """Write three complete events to a JSON lines log."""
+    path = tmp_path / "events.jsonl"
+    path.write_text("".join(json.dumps({"call_sid": f"CALL_{i}"}) + "\n" for i in range(3)))
+    return path
+
+
+class TestOpenTail:
+    """Test tailing the JSON lines events log."""
+
+    def test_last_entries_oldest_first(self, events_log):
+        """The last count entries come back in file order."""
+        entries = list(open_tail(str(events_log), count=2))
+
+        assert [entry["call_sid"] for entry in entries] == ["CALL_1", "CALL_2"]
+
+    def test_partial_last_line_is_not_counted(self, events_log, capsys):
+        """A line still being appended neither takes a slot nor gets reported."""
+        with open(events_log, "a") as f:
+            f.write('{"call_sid": "CALL_')
+
+        entries = list(open_tail(str(events_log), count=2))
+
+        assert [entry["call_sid"] for entry in entries] == ["CALL_1", "CALL_2"]
+        assert list(open_tail(str(events_log), count=None))[-1] == {"call_sid": "CALL_2"}
+        assert capsys.readouterr().err == ""
@@ -1,12 +1,12 @@
 import unittest
 from unittest.mock import patch, MagicMock
-from sqlalchemy.orm import Session
 
 from src.nlp.intent_matcher import IntentMatcher
 from src.nlp.entity_extractor import EntityExtractor, EntityType
 from src.nlp.response_templates import ResponseGenerator  
 from src.nlp.intent_processor import IntentProcessor
 from src.nlp.intent_patterns import IntentType
+from tests.fakes import FakeSession
 from static.constants import (
     AMOUNT_TEXTS, COMPOUND_TEXTS, DATE_TEXTS, 
     DURATION_TEXTS, EMAIL_TEXTS, GREETING_TEXTS, 
@@ -18,54 +18,50 @@ from static.constants import (
 class TestIntentMatcher(unittest.TestCase):
     """Test the Intent Matcher component."""
     
-    def setUp(self):
-        """Set up the matcher instance."""
-        self.matcher = IntentMatcher()
+    @classmethod
+    def setUpClass(cls):
+        """Set up the matcher instance shared by every test."""
+        cls.matcher = IntentMatcher()
     
     def test_match_intent_greeting(self):
         """Test that greeting intents are correctly matched."""
-        greeting_texts = GREETING_TEXTS
-        
-        for text in greeting_texts:
-            intent, confidence = self.matcher.match_intent(text)
-            self.assertEqual(intent, IntentType.GREETING)
-            self.assertGreaterEqual(confidence, 0.5)
+        with self.subTest(corpus="GREETING"):
+            intents, confidences = zip(*self.matcher.match_intent_batch(GREETING_TEXTS))
+            self.assertListEqual(list(intents), [IntentType.GREETING] * len(GREETING_TEXTS))
+            self.assertTrue(all(confidence >= 0.5 for confidence in confidences), confidences)
     
     def test_match_intent_payment_or_inquiry(self):
         """Test that payment intents are correctly matched."""
-        payment_texts = PAYMENT_TEXTS
+        conditions = [IntentType.PAYMENT, IntentType.INQUIRY]
         
-        for text in payment_texts:
-            intent, confidence = self.matcher.match_intent(text)
-            conditions = [IntentType.PAYMENT, IntentType.INQUIRY]
-            self.assertIn(intent, conditions, f"Failed on: {text}")
-            self.assertGreaterEqual(confidence, 0.4)    
+        with self.subTest(corpus="PAYMENT"):
+            intents, confidences = zip(*self.matcher.match_intent_batch(PAYMENT_TEXTS))
+            failed = [text for text, intent in zip(PAYMENT_TEXTS, intents) if intent not in conditions]
+            self.assertListEqual(failed, [])
+            self.assertTrue(all(confidence >= 0.4 for confidence in confidences), confidences)
+    
     def test_match_intent_help(self):
         """Test that help intents are correctly matched."""
-        help_texts = HELP_TEXTS
-        
-        for text in help_texts:
-            intent, confidence = self.matcher.match_intent(text)
-            self.assertEqual(intent, IntentType.HELP)
-            self.assertGreaterEqual(confidence, 0.5)
+        with self.subTest(corpus="HELP"):
+            intents, confidences = zip(*self.matcher.match_intent_batch(HELP_TEXTS))
+            self.assertListEqual(list(intents), [IntentType.HELP] * len(HELP_TEXTS))
+            self.assertTrue(all(confidence >= 0.5 for confidence in confidences), confidences)
     
     def test_match_intent_unknown(self):
         """Test that unknown intents return UNKNOWN with low confidence."""
-        unknown_texts = UNKNOWN_TEXTS
-        
-        for text in unknown_texts:
-            intent, confidence = self.matcher.match_intent(text)
-            self.assertEqual(intent, IntentType.UNKNOWN)
-            self.assertLess(confidence, 0.4)
+        with self.subTest(corpus="UNKNOWN"):
+            intents, confidences = zip(*self.matcher.match_intent_batch(UNKNOWN_TEXTS))
+            self.assertListEqual(list(intents), [IntentType.UNKNOWN] * len(UNKNOWN_TEXTS))
+            self.assertTrue(all(confidence < 0.4 for confidence in confidences), confidences)
     
     def test_match_compound_intent(self):
         """Test that compound intents are correctly matched."""
-        compound_texts = COMPOUND_TEXTS
+        texts, expected_intents = zip(*COMPOUND_TEXTS)
         
-        for text, expected_intent in compound_texts:
-            intent, confidence = self.matcher.match_intent(text)
-            self.assertEqual(intent, expected_intent)
-            self.assertGreaterEqual(confidence, 0.7)
+        with self.subTest(corpus="COMPOUND"):
+            intents, confidences = zip(*self.matcher.match_intent_batch(texts))
+            self.assertListEqual(list(intents), list(expected_intents))
+            self.assertTrue(all(confidence >= 0.7 for confidence in confidences), confidences)
     
     def test_identify_intents(self):
         """Test that multiple intents are identified with threshold."""
@@ -87,72 +83,44 @@ class TestIntentMatcher(unittest.TestCase):
 class TestEntityExtractor(unittest.TestCase):
     """Test the Entity Extractor component."""
     
-    def setUp(self):
-        """Set up the extractor instance."""
-        self.extractor = EntityExtractor()
+    @classmethod
+    def setUpClass(cls):
+        """Set up the extractor instance shared by every test."""
+        cls.extractor = EntityExtractor()
+    
+    def assert_extracts(self, entity_type, texts):
+        """Check every text yields the entity type, reporting all misses at once."""
+        with self.subTest(corpus=entity_type.name):
+            missed = [text for text in texts if not self.extractor.extract_entities(text).get(entity_type)]
+            self.assertListEqual(missed, [])
     
     def test_extract_date_entities(self):
         """Test extracting date entities."""
-        date_texts = DATE_TEXTS
-        
-        for text in date_texts:
-            entities = self.extractor.extract_entities(text)
-            self.assertIn(EntityType.DATE, entities)
-            self.assertGreaterEqual(len(entities[EntityType.DATE]), 1)
+        self.assert_extracts(EntityType.DATE, DATE_TEXTS)
     
     def test_extract_time_entities(self):
         """Test extracting time entities."""
-        time_texts = TIME_TEXTS
-        
-        for text in time_texts:
-            entities = self.extractor.extract_entities(text)
-            self.assertIn(EntityType.TIME, entities)
-            self.assertGreaterEqual(len(entities[EntityType.TIME]), 1)
+        self.assert_extracts(EntityType.TIME, TIME_TEXTS)
     
     def test_extract_phone_number_entities(self):
         """Test extracting phone number entities."""
-        phone_texts = PHONE_TEXTS
-        
-        for text in phone_texts:
-            entities = self.extractor.extract_entities(text)
-            self.assertIn(EntityType.PHONE_NUMBER, entities)
-            self.assertGreaterEqual(len(entities[EntityType.PHONE_NUMBER]), 1)
+        self.assert_extracts(EntityType.PHONE_NUMBER, PHONE_TEXTS)
     
     def test_extract_email_entities(self):
         """Test extracting email entities."""
-        email_texts = EMAIL_TEXTS
-        
-        for text in email_texts:
-            entities = self.extractor.extract_entities(text)
-            self.assertIn(EntityType.EMAIL, entities)
-            self.assertGreaterEqual(len(entities[EntityType.EMAIL]), 1)
+        self.assert_extracts(EntityType.EMAIL, EMAIL_TEXTS)
     
     def test_extract_amount_entities(self):
         """Test extracting monetary amount entities."""
-        amount_texts = AMOUNT_TEXTS
-        
-        for text in amount_texts:
-            entities = self.extractor.extract_entities(text)
-            self.assertIn(EntityType.AMOUNT, entities)
-            self.assertGreaterEqual(len(entities[EntityType.AMOUNT]), 1)
+        self.assert_extracts(EntityType.AMOUNT, AMOUNT_TEXTS)
     
     def test_extract_percentage_entities(self):
         """Test extracting percentage entities."""
-        percentage_texts = PERCENTAGE_TEXTS
-        
-        for text in percentage_texts:
-            entities = self.extractor.extract_entities(text)
-            self.assertIn(EntityType.PERCENTAGE, entities)
-            self.assertGreaterEqual(len(entities[EntityType.PERCENTAGE]), 1)
+        self.assert_extracts(EntityType.PERCENTAGE, PERCENTAGE_TEXTS)
     
     def test_extract_duration_entities(self):
         """Test extracting duration entities."""
-        duration_texts = DURATION_TEXTS
-        
-        for text in duration_texts:
-            entities = self.extractor.extract_entities(text)
-            self.assertIn(EntityType.DURATION, entities)
-            self.assertGreaterEqual(len(entities[EntityType.DURATION]), 1)
+        self.assert_extracts(EntityType.DURATION, DURATION_TEXTS)
     
     def test_extract_multiple_entities(self):
         """Test extracting multiple entity types from a single text."""
@@ -183,14 +151,15 @@ class TestEntityExtractor(unittest.TestCase):
                 value, start, end = match
                 # The text slice at the positions should equal the value
                 self.assertEqual(text[start:end], value)
-
+    
 
 class TestResponseGenerator(unittest.TestCase):
     """Test the Response Generator component."""
     
-    def setUp(self):
-        """Set up the generator instance."""
-        self.generator = ResponseGenerator()
+    @classmethod
+    def setUpClass(cls):
+        """Set up the generator instance shared by every test."""
+        cls.generator = ResponseGenerator()
     
     def test_generate_response_for_intents(self):
         """Test generating responses for different intents."""
@@ -260,36 +229,14 @@ class TestIntentProcessor(unittest.TestCase):
     """Test the Intent Processor component."""
     
     def setUp(self):
-        """Set up the processor and mocks."""
+        """Set up the processor and a fake database session."""
         self.processor = IntentProcessor()
-        self.mock_db = MagicMock(spec=Session)
         self.mock_call_session = MagicMock(id=1, session_id="test_session_1", customer_id=1)
-        self.mock_intent = MagicMock(id=1, name="greeting", description="Greeting intent")
-            
-        def test_process_text(self):
-            """Test processing text to detect intents and entities."""
-            # Configure mock for THIS test
-            def query_side_effect(model_class):
-                mock_query = MagicMock()
-                
-                def filter_side_effect(*args, **kwargs):
-                    mock_filter = MagicMock()
-                    # Looking for the session - return our mock session
-                    if str(args).find("session_id") >= 0 and str(args).find("test_session_1") >= 0:
-                        mock_filter.first.return_value = self.mock_call_session
-                    # Looking for an intent - handle the side effect
-                    elif str(args).find("name") >= 0:
-                        mock_filter.first.side_effect = [None, self.mock_intent]
-                    else:
-                        mock_filter.first.return_value = None
-                    return mock_filter
-                    
-                mock_query.filter.side_effect = filter_side_effect
-                return mock_query
-            
-            # Set up the side effect
-            self.mock_db.query.side_effect = query_side_effect
-            
+        self.mock_db = FakeSession(first_result=self.mock_call_session)
+    
+    def tearDown(self):
+        """Drop cached analyses so tests stay independent."""
+        self.processor.clear_cache()
         
     def test_process_text(self):
         """Test processing text to detect intents and entities."""
@@ -312,14 +259,14 @@ class TestIntentProcessor(unittest.TestCase):
         self.assertGreater(len(response), 10)
         
         # Verify DB operations
-        self.mock_db.query.assert_called()
-        self.mock_db.add.assert_called()
-        self.mock_db.commit.assert_called_once()
+        self.assertGreater(self.mock_db.queries, 0)
+        self.assertTrue(self.mock_db.added)
+        self.assertEqual(self.mock_db.commits, 1)
     
     def test_process_text_session_not_found(self):
         """Test processing text with a non-existent session."""
         # Configure mock to return no session
-        self.mock_db.query.return_value.filter.return_value.first.return_value = None
+        self.mock_db.first_result = None
         
         text = "Hello, how are you?"
         session_id = "nonexistent_session"
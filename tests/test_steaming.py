@@ -1,25 +1,48 @@
 import unittest
-import time
+import itertools
+import pytest
 import os
-import whisper
-from src.stt.stt_base import STTProvider
+import time
+import warnings
+from concurrent import futures
+from types import SimpleNamespace
+import numpy as np
+
+SAMPLE_AUDIO = "data/samples/english_sample.mp3"
 
+@pytest.mark.xdist_group("whisper")
+@unittest.skipIf(not os.path.exists(SAMPLE_AUDIO), 
+                 "Test audio file not found")
 class TestWhisperStreaming(unittest.TestCase):
     """Test the WhisperStreamingTranscriber class."""
     
-    @unittest.skipIf(not os.path.exists("data/samples/english_sample.mp3"), 
-                     "Test audio file not found")
+    @classmethod
+    def setUpClass(cls):
+        """Import Whisper and load the tiny model once, only when the tests actually run."""
+        import whisper
+        from src.stt import get_whisper_provider
+        cls.whisper = whisper
+        cls.provider = get_whisper_provider()
+        cls.tiny_model = whisper.load_model("tiny")
+    
     def test_streaming_transcription(self):
         """Test streaming transcription by simulating chunks."""
-        # Load test audio
-        audio_path = "data/samples/english_sample.mp3"
-        audio = whisper.load_audio(audio_path)
+        whisper = self.whisper
+        
+        # Load test audio once as the 16-bit PCM the transcriber buffers
+        audio = (whisper.load_audio(SAMPLE_AUDIO) * 32767).astype(np.int16)
         
-        # Create streaming transcriber with tiny model for speed
-        transcriber = STTProvider(
+        # Create streaming transcriber with the preloaded tiny model for speed; a fake
+        # clock advancing one second per reading makes its flushes fire on every other
+        # check, and a zero-length sleep only yields to the feeder instead of waiting
+        fake_clock = itertools.count(step=1.0)
+        transcriber = self.provider.create_streaming_transcriber(
             model_name="tiny",
             chunk_size_ms=1000,
-            buffer_size_ms=5000
+            buffer_size_ms=5000,
+            model=self.tiny_model,
+            clock=lambda: next(fake_clock),
+            sleep=lambda seconds: time.sleep(0)
         )
         
         # Callback to collect results
@@ -34,16 +57,29 @@ class TestWhisperStreaming(unittest.TestCase):
         # Calculate chunk size in samples
         chunk_samples = transcriber.chunk_samples
         
-        # Simulate streaming by sending chunks
-        for i in range(0, len(audio), chunk_samples):
-            # Get chunk
-            chunk = audio[i:i+chunk_samples]
+        # Simulate streaming by sending chunks from a background feeder, in order
+        def feed():
+            # View the audio as whole chunks plus any shorter tail, without copying
+            n = (len(audio) // chunk_samples) * chunk_samples
+            chunks = list(audio[:n].reshape(-1, chunk_samples))
+            if n < len(audio):
+                chunks.append(audio[n:])
             
-            # Add to transcriber
-            transcriber.add_audio_chunk(chunk)
-            
-            # Small sleep to simulate real-time processing
-            time.sleep(0.1)
+            for chunk in chunks:
+                # Add to transcriber
+                transcriber.add_audio_chunk(chunk)
+                
+                # Move on as soon as the transcriber drains its buffer, at most 0.1s later
+                if transcriber.buffer_drained.wait(timeout=0.1):
+                    transcriber.buffer_drained.clear()
+        
+        # Bound the feeder by the audio's real-time length so a stalled transcriber cannot hang the run
+        executor = futures.ThreadPoolExecutor(max_workers=1)
+        feeder = executor.submit(feed)
+        done, _ = futures.wait([feeder], timeout=len(audio) / whisper.audio.SAMPLE_RATE)
+        executor.shutdown(wait=False)
+        self.assertIn(feeder, done, "Audio feeder did not finish in real time")
+        feeder.result()
         
         # Get final results
         final_result = transcriber.stop()
@@ -59,5 +95,67 @@ class TestWhisperStreaming(unittest.TestCase):
         print(f"Final transcription: {final_result['text'][:100]}...")
         print(f"Received {len(results)} streaming updates")
 
+class TestStreamingBuffer(unittest.TestCase):
+    """Test the bounded buffer of the streaming transcriber."""
+    
+    def test_oldest_samples_dropped_beyond_window(self):
+        """Test only the newest buffer_size_ms of audio is kept when the model falls behind."""
+        from src.streaming.audio_streaming import AudioStreamManager
+        
+        # Stand-in model that records what it is asked to transcribe
+        received = []
+        def transcribe(audio):
+            received.append(audio)
+            return {"text": "", "segments": []}
+        model = SimpleNamespace(transcribe=transcribe)
+        
+        # A clock that never advances keeps the background loop from flushing early
+        transcriber = AudioStreamManager(model=model, buffer_size_ms=250, clock=lambda: 0.0)
+        transcriber.start(lambda result: None)
+        chunks = [np.arange(i * 1600, (i + 1) * 1600, dtype=np.int16) for i in range(3)]
+        for chunk in chunks:
+            transcriber.add_audio_chunk(chunk)
+        transcriber.stop()
+        
+        # 250 ms at 16 kHz is 4000 samples, so the first 800 are gone
+        expected = np.concatenate(chunks)[-4000:].astype(np.float32) / 32768.0
+        np.testing.assert_allclose(received[-1], expected)
+
+class TestStreamingCudaUpload(unittest.TestCase):
+    """Test the pinned-memory CUDA upload path of the streaming transcriber."""
+    
+    def test_chunks_reach_model_on_gpu(self):
+        """Test buffered chunks are uploaded to the model's device and scaled like the CPU path."""
+        import torch
+        if not torch.cuda.is_available():
+            self.skipTest("CUDA is not available")
+        from src.streaming.audio_streaming import AudioStreamManager
+        
+        # Stand-in model on the GPU that records what it is asked to transcribe
+        received = []
+        def transcribe(audio):
+            received.append(audio)
+            return {"text": "", "segments": []}
+        model = SimpleNamespace(device=torch.device("cuda"), transcribe=transcribe)
+        
+        # A clock that never advances keeps the background loop from flushing early
+        transcriber = AudioStreamManager(model=model, clock=lambda: 0.0)
+        transcriber.start(lambda result: None)
+        chunks = [np.arange(i * 1600, (i + 1) * 1600, dtype=np.int16) for i in range(3)]
+        
+        # Read-only views of the bytes, as receive_audio hands them over, upload without warnings
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            for chunk in chunks:
+                transcriber.add_audio_chunk(np.frombuffer(chunk.tobytes(), dtype=np.int16))
+        transcriber.stop()
+        
+        # The final pass sees every chunk, on the GPU, as float32 audio
+        audio = received[-1]
+        self.assertEqual(audio.device.type, "cuda")
+        self.assertEqual(audio.dtype, torch.float32)
+        expected = np.concatenate(chunks).astype(np.float32) / 32768.0
+        np.testing.assert_allclose(audio.cpu().numpy(), expected)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,19 +1,31 @@
 import unittest
-import whisper
-import torch
+import pytest
 import os
 import time
 import numpy as np
 
+@pytest.mark.xdist_group("whisper")
 class TestSTT(unittest.TestCase):
     """Test basic Whisper functionality."""
     
+    _model = None
+    
+    @classmethod
+    def tiny_model(cls):
+        """Load the tiny model on first use and share it across the tests in this class."""
+        if cls._model is None:
+            import whisper
+            cls._model = whisper.load_model("tiny")
+        return cls._model
+    
     def test_whisper_import(self):
         """Test that Whisper is correctly imported."""
+        import whisper
         self.assertIsNotNone(whisper)
     
     def test_cuda_availability(self):
         """Test CUDA availability."""
+        import torch
         is_available = torch.cuda.is_available()
         if is_available:
             device_name = torch.cuda.get_device_name(0)
@@ -26,7 +38,7 @@ class TestSTT(unittest.TestCase):
     
     def test_model_loading(self):
         """Test loading the tiny model."""
-        model = whisper.load_model("tiny")
+        model = self.tiny_model()
         self.assertIsNotNone(model)
         print(f"Model loaded on device: {model.device}")
         
@@ -39,6 +51,7 @@ class TestSTT(unittest.TestCase):
                      "Test audio file not found")
     def test_audio_loading(self):
         """Test audio loading functionality."""
+        import whisper
         audio_path = "data/samples/english_sample.mp3"
         audio = whisper.load_audio(audio_path)
         
@@ -53,11 +66,18 @@ class TestSTT(unittest.TestCase):
                      "Test audio file not found")
     def test_basic_transcription(self):
         """Test basic transcription with tiny model."""
-        model = whisper.load_model("tiny")
+        import torch
+        model = self.tiny_model()
         audio_path = "data/samples/english_sample.mp3"
         
+        # Greedy single-temperature decoding, in fp16 only where CUDA supports it
         start_time = time.time()
-        result = model.transcribe(audio_path)
+        result = model.transcribe(
+            audio_path,
+            fp16=torch.cuda.is_available(),
+            temperature=0.0,
+            condition_on_previous_text=False
+        )
         transcribe_time = time.time() - start_time
         
         # Verify result structure
@@ -69,6 +89,28 @@ class TestSTT(unittest.TestCase):
         print(f"Transcription completed in {transcribe_time:.2f} seconds")
         print(f"Transcribed text: {result['text'][:100]}...")
         print(f"Number of segments: {len(result['segments'])}")
+    
+    @unittest.skipIf(not os.path.exists("data/samples/english_sample.mp3"), 
+                     "Test audio file not found")
+    def test_beam_search_transcription(self):
+        """Test fp16 beam search transcription with tiny model on CUDA."""
+        import torch
+        if not torch.cuda.is_available():
+            self.skipTest("CUDA only transcription benchmark")
+        
+        model = self.tiny_model()
+        audio_path = "data/samples/english_sample.mp3"
+        
+        start_time = time.time()
+        result = model.transcribe(audio_path, fp16=True, beam_size=5)
+        transcribe_time = time.time() - start_time
+        
+        # Verify result structure
+        self.assertIsInstance(result, dict)
+        self.assertIn("text", result)
+        self.assertIn("segments", result)
+        
+        print(f"Beam search transcription completed in {transcribe_time:.2f} seconds")
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
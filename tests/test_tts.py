@@ -1,8 +1,11 @@
 # tests/test_tts.py
-import unittest
 from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
 import os
+import json
+import shutil
 import tempfile
+import pytest
 
 # Import the TTS components to test
 from src.tts import get_tts_provider
@@ -11,45 +14,54 @@ from src.tts.integrations.google_tts import GoogleTTSProvider
 from src.tts.audio_cache import TTSAudioCache
 from src.tts.voice_profiles import get_voice_for_language, AFRICAN_VOICE_PROFILES
 
-class TestTTS(unittest.TestCase):
-    """Test the Google TTS functionality."""
+@pytest.fixture(scope="module")
+def tts_env():
+    """Patch the Google TTS client and build one provider with a temp cache for the whole module."""
+    # Create a temp directory for cache testing, in RAM-backed tmpfs where available
+    temp_dir = tempfile.mkdtemp(dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
     
-    def setUp(self):
-        """Set up test environment."""
-        # Create a temp directory for cache testing
-        self.temp_dir = tempfile.mkdtemp()
-        
-        # Mock the Google TTS client
-        self.tts_client_patcher = patch('src.tts.google_tts.texttospeech.TextToSpeechClient')
-        self.mock_tts_client = self.tts_client_patcher.start()
-        
+    # Mock the Google TTS client
+    tts_client_patcher = patch('src.tts.integrations.google_tts.texttospeech.TextToSpeechClient')
+    mock_tts_client = tts_client_patcher.start()
+    
+    try:
         # Mock response
-        self.mock_response = MagicMock()
-        self.mock_response.audio_content = b'test_audio_content'
-        self.mock_tts_client.return_value.synthesize_speech.return_value = self.mock_response
+        mock_response = MagicMock()
+        mock_response.audio_content = b'test_audio_content'
+        mock_tts_client.return_value.synthesize_speech.return_value = mock_response
         
         # Mock list voices response
-        self.mock_voices_response = MagicMock()
+        mock_voices_response = MagicMock()
         mock_voice = MagicMock()
         mock_voice.name = "en-US-Neural2-F"
         mock_voice.language_codes = ["en-US"]
         mock_voice.ssml_gender = "FEMALE"
         mock_voice.natural_sample_rate_hertz = 24000
-        self.mock_voices_response.voices = [mock_voice]
-        self.mock_tts_client.return_value.list_voices.return_value = self.mock_voices_response
+        mock_voices_response.voices = [mock_voice]
+        mock_tts_client.return_value.list_voices.return_value = mock_voices_response
         
         # Create a test instance with mocked components
-        self.tts_provider = GoogleTTSProvider()
-        self.tts_provider.cache = TTSAudioCache(self.temp_dir)
+        tts_provider = GoogleTTSProvider()
+        tts_provider.cache = TTSAudioCache(temp_dir)
+        
+        yield SimpleNamespace(temp_dir=temp_dir, mock_tts_client=mock_tts_client, tts_provider=tts_provider)
+    finally:
+        # Stop patches and clean up temp files
+        tts_client_patcher.stop()
+        shutil.rmtree(temp_dir)
+
+class TestTTS:
+    """Test the Google TTS functionality."""
     
-    def tearDown(self):
-        """Clean up after tests."""
-        # Stop patches
-        self.tts_client_patcher.stop()
-        
-        # Clean up temp files
-        import shutil
-        shutil.rmtree(self.temp_dir)
+    @pytest.fixture(autouse=True)
+    def setup(self, tts_env):
+        """Expose the shared TTS environment and reset its call counts for each test."""
+        self.temp_dir = tts_env.temp_dir
+        self.mock_tts_client = tts_env.mock_tts_client
+        self.tts_provider = tts_env.tts_provider
+        
+        self.mock_tts_client.return_value.synthesize_speech.reset_mock()
+        self.mock_tts_client.return_value.list_voices.reset_mock()
     
     def test_tts_synthesis(self):
         """Test basic TTS synthesis."""
@@ -62,21 +74,21 @@ class TestTTS(unittest.TestCase):
         self.mock_tts_client.return_value.synthesize_speech.assert_called_once()
         
         # Verify returned content
-        self.assertEqual(audio_content, b'test_audio_content')
+        assert audio_content == b'test_audio_content'
     
     def test_voice_selection(self):
         """Test voice selection logic."""
         # Test default voice
         default_voice = get_voice_for_language("en-US")
-        self.assertEqual(default_voice["name"], "en-US-Neural2-F")
+        assert default_voice["name"] == "en-US-Neural2-F"
         
         # Test African language voice
         swahili_voice = get_voice_for_language("sw")
-        self.assertEqual(swahili_voice["name"], "sw-KE-Standard-A")
+        assert swahili_voice["name"] == "sw-KE-Standard-A"
         
         # Test fallback for unsupported language
         yoruba_voice = get_voice_for_language("yo")
-        self.assertIsNotNone(yoruba_voice["fallback"])
+        assert yoruba_voice["fallback"] is not None
     
     def test_tts_cache(self):
         """Test TTS audio caching."""
@@ -105,12 +117,12 @@ class TestTTS(unittest.TestCase):
         saved_path = self.tts_provider.save_to_file(audio_content, file_path)
         
         # Verify file was saved
-        self.assertTrue(os.path.exists(saved_path))
+        assert os.path.exists(saved_path)
         
         # Verify content
         with open(saved_path, 'rb') as f:
             saved_content = f.read()
-        self.assertEqual(saved_content, audio_content)
+        assert saved_content == audio_content
     
     def test_list_voices(self):
         """Test listing available voices."""
@@ -120,8 +132,8 @@ class TestTTS(unittest.TestCase):
         self.mock_tts_client.return_value.list_voices.assert_called_once()
         
         # Verify returned data
-        self.assertEqual(len(voices), 1)
-        self.assertEqual(voices[0]["name"], "en-US-Neural2-F")
+        assert len(voices) == 1
+        assert voices[0]["name"] == "en-US-Neural2-F"
     
     def test_factory_method(self):
         """Test the TTS factory method."""
@@ -137,25 +149,81 @@ class TestTTS(unittest.TestCase):
             
             # Verify correct provider was created
             mock_google_provider.assert_called_once()
-            self.assertEqual(provider, provider_instance)
+            assert provider == provider_instance
+
+class TestTTSAudioCache:
+    """Test the content-addressed TTS audio cache."""
+    
+    def test_store_and_get_round_trip(self, tmp_path):
+        """Stored audio is written to its sharded path and read back from disk."""
+        cache = TTSAudioCache(str(tmp_path))
+        path = cache.store_audio("Hello", "en-US-Neural2-F", "en-US", b'stored_audio')
+        
+        # Sharded under the cache directory, with no temporary file left behind
+        key = cache._generate_key("Hello", "en-US-Neural2-F", "en-US")
+        assert path == os.path.join(str(tmp_path), key[:2], key[2:4], f"{key}.mp3")
+        assert os.listdir(os.path.dirname(path)) == [f"{key}.mp3"]
+        
+        # A fresh cache has nothing in memory, so this reads the file
+        fresh = TTSAudioCache(str(tmp_path))
+        assert fresh.get_cached_audio_path("Hello", "en-US-Neural2-F", "en-US") == path
+        assert fresh.get_cached_audio("Hello", "en-US-Neural2-F", "en-US") == b'stored_audio'
+        assert fresh.get_cached_audio("Hello", "en-US-Neural2-F", "sw") is None
+    
+    def test_finds_legacy_md5_entries(self, tmp_path):
+        """Audio indexed under the older md5 key is still found."""
+        audio_path = tmp_path / "legacy.mp3"
+        audio_path.write_bytes(b'legacy_audio')
+        legacy_key = TTSAudioCache._legacy_key("Hello", "en-US-Neural2-F", "en-US")
+        (tmp_path / "cache_index.json").write_text(json.dumps({legacy_key: str(audio_path)}))
+        
+        cache = TTSAudioCache(str(tmp_path))
+        
+        assert cache.get_cached_audio_path("Hello", "en-US-Neural2-F", "en-US") == str(audio_path)
+        assert cache.get_cached_audio("Hello", "en-US-Neural2-F", "en-US") == b'legacy_audio'
+    
+    def test_memory_evicts_oldest_audio(self, tmp_path):
+        """Audio beyond the memory limit evicts the least recently used entries first."""
+        cache = TTSAudioCache(str(tmp_path), memory_limit_bytes=10)
+        texts = ["one", "two", "three"]
+        paths = [cache.store_audio(text, "en-US-Neural2-F", "en-US", b'4byt') for text in texts]
+        
+        # Only memory can answer once the files are gone
+        for path in paths:
+            os.remove(path)
+        
+        assert cache.get_cached_audio("one", "en-US-Neural2-F", "en-US") is None
+        assert cache.get_cached_audio("two", "en-US-Neural2-F", "en-US") == b'4byt'
+        assert cache.get_cached_audio("three", "en-US-Neural2-F", "en-US") == b'4byt'
+    
+    def test_clear_cache_removes_shards(self, tmp_path):
+        """Clearing the cache removes the shard directories but leaves other files alone."""
+        cache = TTSAudioCache(str(tmp_path))
+        path = cache.store_audio("Hello", "en-US-Neural2-F", "en-US", b'stored_audio')
+        (tmp_path / "notes").mkdir()
+        
+        cache.clear_cache()
+        
+        assert not os.path.exists(path)
+        assert sorted(os.listdir(tmp_path)) == ["cache_index.json", "notes"]
+        assert cache.get_cached_audio("Hello", "en-US-Neural2-F", "en-US") is None
 
-class TestVoiceProfiles(unittest.TestCase):
+class TestVoiceProfiles:
     """Test the voice profile selection logic."""
     
     # def test_african_voices_configuration(self):
     #     """Test that all required African languages have voice profiles."""
     #     required_languages = ["en-ZA", "sw", "ar", "yo", "ha", "zu", "af"]
         
-    #     self.assertGreaterEqual(len(AFRICAN_VOICE_PROFILES), 1, "At least one voice profile required")
+    #     assert len(AFRICAN_VOICE_PROFILES) >= 1, "At least one voice profile required"
     #     for lang in required_languages:
-    #         self.assertIn(lang, AFRICAN_VOICE_PROFILES, f"No voice profile for {lang}")
+    #         assert lang in AFRICAN_VOICE_PROFILES, f"No voice profile for {lang}"
     
     def test_voice_fallbacks(self):
         """Test that all voice profiles have fallbacks configured."""
         for lang, profile in AFRICAN_VOICE_PROFILES.items():
-            self.assertIn("fallback", profile, f"No fallback for {lang}")
-            self.assertIsNotNone(profile["fallback"])
+            assert "fallback" in profile, f"No fallback for {lang}"
+            assert profile["fallback"] is not None
 
 if __name__ == "__main__":
-    unittest.main()
-    
\ No newline at end of file
+    raise SystemExit(pytest.main([__file__]))
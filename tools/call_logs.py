@@ -1,123 +1,316 @@
 # app/tools/call_logs.py
 import os
+import re
+import sys
+import heapq
 import json
+import mmap
+import shutil
 from datetime import datetime
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+# Optional streaming JSON parser, preferring its C backend
+try:
+    import ijson
+    from ijson.common import JSONError as _StreamParseError
+    try:
+        ijson = ijson.get_backend("yajl2_c")
+    except ImportError:
+        pass
+except ImportError:
+    ijson = None
+
+# Optional faster JSON parser, reading bytes directly
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Runs of digits long enough to overflow a 64-bit integer, which orjson does not parse exactly
+_LONG_DIGITS = re.compile(rb'\d{19}')
+
+def _loads(data):
+    """Parse JSON bytes with orjson where it gives the same result as the stdlib json module."""
+    if orjson is not None and not _LONG_DIGITS.search(data):
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # Let the stdlib parser decide, and word any error
+            pass
+    return json.loads(data)
+
+# Optional C parser for ISO 8601 timestamps
+try:
+    from ciso8601 import parse_datetime
+except ImportError:
+    parse_datetime = datetime.fromisoformat
+
+# Entry fields shown on their own lines; headers are left out as too verbose
+_KNOWN_KEYS = frozenset({
+    'call_sid', 'phone_number', 'direction', 'status', 'timestamp',
+    'duration', 'durationInSeconds', 'dtmf_digits', 'headers'
+})
+
+@dataclass(slots=True)
+class CallLogEntry:
+    """The fields of a call log entry that are displayed."""
+    call_sid: Any = 'N/A'
+    phone_number: Any = 'N/A'
+    direction: Any = 'N/A'
+    status: Any = 'N/A'
+    timestamp: Optional[str] = None
+    duration: Any = None
+    dtmf_digits: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+    
+    @classmethod
+    def from_dict(cls, raw):
+        """Build an entry from a parsed log record, collecting unknown keys as extra data."""
+        return cls(
+            call_sid=raw.get('call_sid', 'N/A'),
+            phone_number=raw.get('phone_number', 'N/A'),
+            direction=raw.get('direction', 'N/A'),
+            status=raw.get('status', 'N/A'),
+            timestamp=raw.get('timestamp'),
+            duration=raw.get('duration') or raw.get('durationInSeconds'),
+            dtmf_digits=raw.get('dtmf_digits'),
+            extra={key: value for key, value in raw.items() if key not in _KNOWN_KEYS}
+        )
+
+def _modified_time(entry):
+    """Modification time of a directory entry (one stat call per entry on Linux)."""
+    return entry.stat().st_mtime
+
+def _scan_log_files(log_dir):
+    """Yield the directory entries of the log files in log_dir, in a single directory pass."""
+    with os.scandir(log_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".json"):
+                yield entry
 
 def get_log_files(log_dir="logs/calls", count=10):
-    """Get the most recent log files."""
+    """Get the most recent log files, or all of them (newest first) if count is None."""
     if not os.path.exists(log_dir):
         print(f"Log directory {log_dir} does not exist.")
         return []
     
-    # Get all log files
-    log_files = []
-    for filename in os.listdir(log_dir):
-        if filename.endswith(".json"):
-            file_path = os.path.join(log_dir, filename)
-            modified_time = os.path.getmtime(file_path)
-            log_files.append((file_path, modified_time))
+    # Keep only the newest files instead of sorting the whole directory
+    if count is None:
+        log_files = sorted(_scan_log_files(log_dir), key=_modified_time, reverse=True)
+    else:
+        log_files = heapq.nlargest(count, _scan_log_files(log_dir), key=_modified_time)
+    
+    return [entry.path for entry in log_files]
+
+def open_tail(path, count=10):
+    """Yield the last count entries of a JSON lines log, oldest first, or all of them if count is None.
     
-    # Sort by modification time (newest first)
-    log_files.sort(key=lambda x: x[1], reverse=True)
+    Only complete lines are read, so an entry still being appended is left for the next call.
+    Complete lines that cannot be decoded are skipped.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
     
-    # Return the requested number of files
-    return [f[0] for f in log_files[:count]]
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Stop just after the last newline so a partially written line is not counted
+        end = mm.rfind(b'\n') + 1
+        
+        # Walk back from there to the start of the count-th last line
+        start = 0
+        if count is not None:
+            start = end - 1
+            for _ in range(count):
+                start = mm.rfind(b'\n', 0, start)
+                if start < 0:
+                    break
+            start += 1
+        
+        for line in mm[start:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                yield _loads(line)
+            except ValueError:
+                print(f"Skipping unreadable event line: {line[:50]!r}", file=sys.stderr)
 
-def display_call_log(log_file):
-    """Display the contents of a call log file."""
-    print("\n" + "=" * 50)
-    print(f"Log File: {os.path.basename(log_file)}")
-    print("-" * 50)
+def format_call_log(log_file):
+    """Format the contents of a call log file for display."""
+    parts = ["\n" + "=" * 50 + "\n", f"Log File: {os.path.basename(log_file)}\n", "-" * 50 + "\n"]
     
     try:
-        with open(log_file, 'r') as f:
-            log_data = json.load(f)
+        entries = None
+        if ijson is not None:
+            try:
+                with open(log_file, 'rb') as f:
+                    entries = [format_log_entry(entry, index) for entry, index in iter_log_entries(f)]
+            except _StreamParseError:
+                # yajl rejects some valid JSON (e.g. integers beyond 64 bits), so parse the whole file instead
+                entries = None
         
-        if isinstance(log_data, list):
-            # Multiple entries in the log
-            for i, entry in enumerate(log_data):
-                display_log_entry(entry, i+1)
-        else:
-            # Single entry
-            display_log_entry(log_data)
+        if entries is None:
+            with open(log_file, 'rb') as f:
+                log_data = _loads(f.read())
+            
+            if isinstance(log_data, list):
+                # Multiple entries in the log
+                entries = [format_log_entry(entry, i+1) for i, entry in enumerate(log_data)]
+            else:
+                # Single entry
+                entries = [format_log_entry(log_data)]
+        
+        parts.extend(entries)
             
     except Exception as e:
-        print(f"Error reading log file: {str(e)}")
+        parts.append(f"Error reading log file: {str(e)}\n")
+    
+    return "".join(parts)
 
-def display_log_entry(entry, index=None):
-    """Display a single log entry."""
+def display_call_log(log_file):
+    """Display the contents of a call log file."""
+    sys.stdout.write(format_call_log(log_file))
+
+def iter_log_entries(f):
+    """Yield (entry, index) for each entry of an open binary log file as it is parsed, without loading the whole file."""
+    if f.peek(64).lstrip()[:1] == b'[':
+        # Multiple entries in the log
+        for i, entry in enumerate(ijson.items(f, 'item', use_float=True)):
+            yield entry, i+1
+        return
+    
+    # One object, or several concatenated ones (e.g. JSON lines)
+    entries = ijson.items(f, '', use_float=True, multiple_values=True)
+    entry = next(entries, None)
+    following = next(entries, None)
+    if following is None:
+        # Single entry
+        if entry is not None:
+            yield entry, None
+        return
+    
+    yield entry, 1
+    yield following, 2
+    for i, entry in enumerate(entries, 3):
+        yield entry, i
+
+def format_log_entry(entry, index=None):
+    """Format a single log entry for display."""
+    entry = CallLogEntry.from_dict(entry)
+    
+    lines = []
     if index is not None:
-        print(f"\nEntry {index}:")
+        lines.append(f"\nEntry {index}:")
     
-    print(f"Call SID: {entry.get('call_sid', 'N/A')}")
-    print(f"Phone: {entry.get('phone_number', 'N/A')}")
-    print(f"Direction: {entry.get('direction', 'N/A')}")
-    print(f"Status: {entry.get('status', 'N/A')}")
+    lines.append(f"Call SID: {entry.call_sid}")
+    lines.append(f"Phone: {entry.phone_number}")
+    lines.append(f"Direction: {entry.direction}")
+    lines.append(f"Status: {entry.status}")
     
     # Format timestamp if present
-    timestamp = entry.get('timestamp')
-    if timestamp:
+    if entry.timestamp:
         try:
-            dt = datetime.fromisoformat(timestamp)
+            dt = parse_datetime(entry.timestamp)
             formatted_time = dt.strftime("%Y-%m-%d %H:%M:%S")
-            print(f"Time: {formatted_time}")
+            lines.append(f"Time: {formatted_time}")
         except:
-            print(f"Time: {timestamp}")
+            lines.append(f"Time: {entry.timestamp}")
     
     # Display duration if present
-    duration = entry.get('duration')
-    if duration:
-        print(f"Duration: {duration} seconds")
-    elif entry.get('durationInSeconds'):
-        print(f"Duration: {entry.get('durationInSeconds')} seconds")
+    if entry.duration:
+        lines.append(f"Duration: {entry.duration} seconds")
     
     # Display DTMF digits if present
-    dtmf_digits = entry.get('dtmf_digits')
-    if dtmf_digits:
-        print(f"DTMF Input: {dtmf_digits}")
-    
-    # Display additional data if present, excluding headers which are too verbose
-    additional_data = {}
-    for key, value in entry.items():
-        if key not in ['call_sid', 'phone_number', 'direction', 'status', 'timestamp', 
-                       'duration', 'durationInSeconds', 'dtmf_digits', 'headers']:
-            additional_data[key] = value
-    
-    if additional_data:
-        print("Additional Data:")
-        for key, value in additional_data.items():
-            print(f"  {key}: {value}")
+    if entry.dtmf_digits:
+        lines.append(f"DTMF Input: {entry.dtmf_digits}")
+    
+    # Display additional data if present
+    if entry.extra:
+        lines.append("Additional Data:")
+        for key, value in entry.extra.items():
+            lines.append(f"  {key}: {value}")
+    
+    return "\n".join(lines) + "\n"
+
+def display_log_entry(entry, index=None):
+    """Display a single log entry."""
+    sys.stdout.write(format_log_entry(entry, index))
+
+def write_raw_logs(log_files):
+    """Copy log files to stdout unchanged, one after another, letting the kernel move the bytes where it can."""
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    out.flush()
+    
+    for log_file in log_files:
+        with open(log_file, 'rb') as src:
+            size = os.fstat(src.fileno()).st_size
+            try:
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(out.fileno(), src.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            except (AttributeError, OSError):
+                # No sendfile for this platform or output; copy through userspace instead
+                src.seek(offset)
+                shutil.copyfileobj(src, out)
+                out.flush()
+        os.write(out.fileno(), b"\n")
 
 def main():
     parser = argparse.ArgumentParser(description="View recent call logs")
     parser.add_argument("--count", "-n", type=int, default=5, help="Number of recent logs to show")
     parser.add_argument("--all", "-a", action="store_true", help="Show all logs")
     parser.add_argument("--call-sid", "-c", help="Show logs for a specific Call SID/Session ID")
+    parser.add_argument("--events", "-e", action="store_true", help="Show the most recent call events across all calls")
+    parser.add_argument("--raw", "-r", action="store_true", help="Output the log files' JSON unchanged")
     args = parser.parse_args()
     
     # Directory for call logs
     log_dir = "logs/calls"
     
-    if args.call_sid:
+    if args.events:
+        # Show the tail of the shared event log
+        count = None if args.all else args.count
+        entries = list(open_tail(os.path.join(log_dir, "events.jsonl"), count))
+        if not entries:
+            print("No call events found.")
+            return
+        
+        print(f"Displaying {len(entries)} recent call events:")
+        sys.stdout.write("".join(format_log_entry(entry, i+1) for i, entry in enumerate(entries)))
+    elif args.call_sid:
         # Show logs for a specific Call SID
         log_file = os.path.join(log_dir, f"{args.call_sid}.json")
         if os.path.exists(log_file):
-            display_call_log(log_file)
+            if args.raw:
+                write_raw_logs([log_file])
+            else:
+                display_call_log(log_file)
         else:
             print(f"No log file found for Call SID/Session ID: {args.call_sid}")
     else:
         # Show the most recent logs
-        count = 999999 if args.all else args.count
+        count = None if args.all else args.count
         log_files = get_log_files(log_dir, count)
         
         if not log_files:
             print("No call logs found.")
             return
         
+        if args.raw:
+            write_raw_logs(log_files)
+            return
+        
         print(f"Displaying {len(log_files)} recent call logs:")
-        for log_file in log_files:
-            display_call_log(log_file)
+        
+        # Read and format files in parallel, writing them out in the original order
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            for formatted_log in executor.map(format_call_log, log_files):
+                sys.stdout.write(formatted_log)
 
 if __name__ == "__main__":
     main()
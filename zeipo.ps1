@@ -401,21 +401,21 @@ switch ($Command) {
         Write-ZeipoMessage "Running all tests..." -Color Yellow
         Write-ZeipoMessage "Starting container (if needed)..." -Color Yellow
         Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' up -d"
-        Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' exec core python -m unittest discover tests"
+        Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' exec core python -m pytest"
     }
 
     "test-at" {
         Write-ZeipoMessage "Running Africa's Talking tests..." -Color Yellow
         Write-ZeipoMessage "Starting container (if needed)..." -Color Yellow
         Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' up -d"
-        Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' exec core python -m tests.test_at"
+        Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' exec core python -m pytest tests/test_at.py"
     }
 
     "test-api" {
         Write-ZeipoMessage "Running API tests..." -Color Yellow
         Write-ZeipoMessage "Starting container (if needed)..." -Color Yellow
         Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' up -d"
-        Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' exec core python -m tests.test_api"
+        Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' exec core python -m pytest tests/test_api.py"
     }
 
     "test-stt" {
@@ -429,7 +429,7 @@ switch ($Command) {
         Write-ZeipoMessage "Running Google TTS tests..." -Color Yellow
         Write-ZeipoMessage "Starting container (if needed)..." -Color Yellow
         Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' up -d"
-        Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' exec core python -m tests.test_tts"
+        Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' exec core python -m pytest tests/test_tts.py"
     }
 
     "test-streaming" {
@@ -450,7 +450,7 @@ switch ($Command) {
         Write-ZeipoMessage "Running NLU tests..." -Color Yellow
         Write-ZeipoMessage "Starting container (if needed)..." -Color Yellow
         Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' up -d"
-        Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' exec core python -m tests.test_nlu"
+        Invoke-WslCommand "cd '$wslProjectRoot' && docker compose -f '$wslComposeFile' exec core python -m pytest tests/test_nlu.py"
     }
 
     "test" {